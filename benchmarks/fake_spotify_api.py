@@ -0,0 +1,186 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests
+import spotipy
+from spotipy import Spotify
+
+IMAGE_SIZES = (640, 300, 64)
+SOURCE_ID_PATTERN = re.compile(r'size(\d+)')  # playlist and album ids 'size<N>' contain N tracks
+
+DEFAULT_LATENCY = 0.0
+
+
+class FakeSpotifyAPI:
+    latency: float
+    calls: dict[str, int]
+    hits: int
+    rate_limited: int
+    retry_after: float
+    _server: Optional[ThreadingHTTPServer]
+    _thread: Optional[threading.Thread]
+    _lock: threading.Lock
+
+    def __init__(self, latency: float = DEFAULT_LATENCY):
+        self.latency = latency
+        self.calls = dict()
+        self.hits = 0
+        self.rate_limited = 0
+        self.retry_after = 1.0
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def prefix(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/v1/'
+
+    def start(self) -> 'FakeSpotifyAPI':
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                api.handle(self)
+
+            def do_POST(self):
+                api.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def client(self, session: Optional[requests.Session] = None) -> Spotify:
+        spotify = spotipy.Spotify(auth='fake-token', requests_session=session or True, retries=0)
+        spotify.prefix = self.prefix
+        return spotify
+
+    def reset_calls(self):
+        with self._lock:
+            self.calls.clear()
+            self.hits = 0
+
+    def rate_limit(self, count: int, retry_after: float = 1.0):
+        with self._lock:
+            self.rate_limited = count
+            self.retry_after = retry_after
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        url = urlparse(request.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split('/') if part][1:]
+
+        with self._lock:
+            self.hits += 1
+            if self.rate_limited:
+                self.rate_limited -= 1
+                request.send_response(429)
+                request.send_header('Retry-After', str(self.retry_after))
+                request.send_header('Content-Length', '0')
+                request.end_headers()
+                return
+
+        endpoint, body = self.route(parts, query)
+        with self._lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        request.send_response(200 if body is not None else 404)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def route(self, parts: list[str], query: dict[str, str]) -> tuple[str, Optional[dict]]:
+        if parts == ['me']:
+            return 'current_user', {'id': 'bench', 'display_name': 'Benchmark'}
+        if parts == ['me', 'player', 'queue']:
+            return 'add_to_queue', {}
+        if parts == ['tracks']:
+            return 'tracks', {'tracks': [track(int(track_id)) for track_id in query['ids'].split(',')]}
+        if parts == ['audio-features']:
+            return 'audio_features', {'audio_features': [features(int(track_id)) for track_id in query['ids'].split(',')]}
+        if len(parts) >= 2 and parts[0] in ('playlists', 'albums') and SOURCE_ID_PATTERN.fullmatch(parts[1]):
+            size = source_size(parts[1])
+            offset = int(query.get('offset', 0))
+            limit = int(query.get('limit', 100))
+            if parts[0] == 'playlists':
+                if len(parts) == 2:
+                    return 'playlist', {'id': parts[1], 'name': f'Playlist {size}', 'snapshot_id': f'snapshot{size}'}
+                items = [{'track': track(idx)} for idx in range(offset, min(offset + limit, size))]
+                return 'playlist_items', page(items, offset, limit, size)
+            if len(parts) == 2:
+                return 'album', {'id': parts[1], 'name': f'Album {size}', 'images': images()}
+            items = [album_track(idx) for idx in range(offset, min(offset + limit, size))]
+            return 'album_tracks', page(items, offset, limit, size)
+        return 'unknown', None
+
+
+def source_size(source_id: str) -> int:
+    match = SOURCE_ID_PATTERN.fullmatch(source_id)
+    return int(match.group(1)) if match else 0
+
+
+def fake_track_id(idx: int) -> str:
+    return f'{idx:022d}'
+
+
+def images() -> list[dict]:
+    return [{'url': f'https://i.example.com/{size}', 'height': size, 'width': size} for size in IMAGE_SIZES]
+
+
+def album_track(idx: int) -> dict:
+    return {
+        'id': fake_track_id(idx),
+        'uri': f'spotify:track:{fake_track_id(idx)}',
+        'name': f'Track {idx}',
+        'artists': [{'name': f'Artist {idx % 97}'}, {'name': f'Artist {idx % 13}'}]
+    }
+
+
+def track(idx: int) -> dict:
+    result = album_track(idx)
+    result['album'] = {'images': images()}
+    return result
+
+
+def features(idx: int) -> dict:
+    return {
+        'id': fake_track_id(idx),
+        'tempo': 60.0 + (idx * 7919 % 1400) / 10,
+        'acousticness': (idx % 100) / 100,
+        'danceability': (idx * 3 % 100) / 100,
+        'energy': (idx * 7 % 100) / 100,
+        'instrumentalness': (idx * 11 % 100) / 100,
+        'valence': (idx * 13 % 100) / 100
+    }
+
+
+def page(items: list[dict], offset: int, limit: int, total: int) -> dict:
+    return {
+        'items': items,
+        'offset': offset,
+        'limit': limit,
+        'total': total,
+        'next': 'next' if offset + limit < total else None
+    }
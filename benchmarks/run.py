@@ -0,0 +1,208 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import product
+from typing import Callable, Optional
+
+import data.spotify_content_extraction as content_extr
+from benchmarks.fake_spotify_api import FakeSpotifyAPI
+from data.content_store import ContentStore
+from data.http_session import build_session
+from data.load_jobs import LoadJobs
+from data.request_scheduler import RequestScheduler
+from data.single_flight import SingleFlight
+from data.track_cache import TrackCache
+from data.track_table import TrackTable
+from data.view_cache import ViewCache
+from ui.callbacks import callbacks, SORT_STATE_NONE, SORT_STATE_ASC, SORT_STATE_DESC
+
+DEFAULT_SIZES = (100, 1000, 10000, 50000)
+DEFAULT_LATENCY = 0.02
+DEFAULT_RATE = 1000000.0
+DEFAULT_LOAD_REPEAT = 3
+DEFAULT_RENDER_REPEAT = 20
+
+SORT_STATES = (SORT_STATE_NONE, SORT_STATE_ASC, SORT_STATE_DESC)
+FILTERS = {
+    'none': {},
+    'greater': {'greater': 90},
+    'smaller': {'smaller': 140},
+    'range': {'greater': 90, 'smaller': 140},
+    'corrected': {'double': 70, 'half': 150, 'greater': 90, 'smaller': 140}
+}
+
+
+class CallbackRecorder:
+    functions: dict[str, Callable]
+
+    def __init__(self):
+        self.functions = dict()
+
+    def callback(self, *args, **kwargs):
+        def register(function: Callable) -> Callable:
+            self.functions[function.__name__] = function
+            return function
+        return register
+
+    def clientside_callback(self, *args, **kwargs):
+        pass
+
+
+def measure(function: Callable[[], None], repeat: int, setup: Optional[Callable[[], None]] = None) -> dict:
+    timings = list()
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {
+        'repeat': repeat,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'max': max(timings)
+    }
+
+
+def reset_extraction(rate: float, track_cache: Optional[TrackCache] = None):
+    content_extr.scheduler = RequestScheduler(rate=rate, burst=max(int(rate), 1))
+    content_extr.single_flight = SingleFlight()
+    content_extr.track_cache = track_cache
+    content_extr.track_library = None
+
+
+def bench_loads(api: FakeSpotifyAPI, args) -> list[dict]:
+    spotify = api.client(build_session(pool_size=content_extr.MAX_FETCH_WORKERS * 2))
+    results = list()
+    for size in args.sizes:
+        source_id = f'size{size}'
+        for name, load in (('load_playlist', content_extr.get_content_playlist), ('load_album', content_extr.get_content_album)):
+            api.reset_calls()
+            stats = measure(lambda: load(spotify, source_id), args.load_repeat, lambda: reset_extraction(args.rate))
+            results.append({'name': name, 'params': {'size': size, 'latency': api.latency}, 'seconds': stats, 'calls': calls_per_run(api, args.load_repeat)})
+            log(results[-1])
+
+        with tempfile.TemporaryDirectory() as directory:
+            track_cache = TrackCache(f'{directory}/cache.sqlite')
+            reset_extraction(args.rate, track_cache)
+            content_extr.get_content_playlist(spotify, source_id)
+            api.reset_calls()
+            stats = measure(
+                lambda: content_extr.get_content_playlist(spotify, source_id),
+                args.load_repeat,
+                lambda: reset_extraction(args.rate, track_cache)
+            )
+            results.append({'name': 'load_playlist_cached', 'params': {'size': size, 'latency': api.latency}, 'seconds': stats, 'calls': calls_per_run(api, args.load_repeat)})
+            log(results[-1])
+    reset_extraction(args.rate)
+    return results
+
+
+def bench_renders(api: FakeSpotifyAPI, args) -> list[dict]:
+    spotify = api.client()
+    content_store = ContentStore()
+    view_cache = ViewCache()
+    recorder = CallbackRecorder()
+    callbacks(recorder, None, content_store, view_cache, LoadJobs(), compact_tiles=not args.full_tiles)
+    update_content = recorder.functions['update_content']
+
+    results = list()
+    for size in args.sizes:
+        reset_extraction(args.rate)
+        handle = content_store.put(TrackTable.from_content(content_extr.get_content_playlist(spotify, f'size{size}')))
+        for (filter_name, filter_settings), sort_state in product(FILTERS.items(), SORT_STATES):
+            version = [0]
+
+            def render():
+                update_content(None, None, None, version[0], 1, handle, filter_settings, sort_state, {}, [])
+
+            def invalidate():
+                version[0] += 1
+
+            params = {'size': size, 'filter': filter_name, 'sort': sort_state}
+            results.append({'name': 'update_content_cold', 'params': params, 'seconds': measure(render, args.render_repeat, invalidate)})
+            log(results[-1])
+            results.append({'name': 'update_content_warm', 'params': params, 'seconds': measure(render, args.render_repeat)})
+            log(results[-1])
+    return results
+
+
+def calls_per_run(api: FakeSpotifyAPI, repeat: int) -> dict[str, float]:
+    return {endpoint: count / repeat for endpoint, count in api.calls.items()}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def log(result: dict):
+    params = ' '.join(f'{key}={value}' for key, value in result['params'].items())
+    print(f'{result["name"]:<24} {params:<48} median {result["seconds"]["median"] * 1000:10.2f} ms', file=sys.stderr)
+
+
+def compare(results: list[dict], baseline_path: str):
+    with open(baseline_path, encoding='utf-8') as file:
+        baseline = {
+            (result['name'], json.dumps(result['params'], sort_keys=True)): result['seconds']['median']
+            for result in json.load(file)['results']
+        }
+    print('\nCompared to ' + baseline_path, file=sys.stderr)
+    for result in results:
+        previous = baseline.get((result['name'], json.dumps(result['params'], sort_keys=True)))
+        if previous:
+            ratio = result['seconds']['median'] / previous
+            params = ' '.join(f'{key}={value}' for key, value in result['params'].items())
+            print(f'{result["name"]:<24} {params:<48} {ratio:6.2f}x', file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark musicalify against a local fake Spotify API.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help='source sizes in tracks')
+    parser.add_argument('--latency', type=float, default=DEFAULT_LATENCY, help='fake API latency per request in seconds')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='request scheduler rate in requests per second')
+    parser.add_argument('--load-repeat', type=int, default=DEFAULT_LOAD_REPEAT)
+    parser.add_argument('--render-repeat', type=int, default=DEFAULT_RENDER_REPEAT)
+    parser.add_argument('--only', choices=('loads', 'renders'), help='run only one group of benchmarks')
+    parser.add_argument('--full-tiles', action='store_true', help='render full track tiles instead of compact ones')
+    parser.add_argument('--output', help='write JSON results to this file instead of stdout')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare medians against')
+    args = parser.parse_args()
+
+    api = FakeSpotifyAPI(latency=args.latency).start()
+    try:
+        results = list()
+        if args.only != 'renders':
+            results.extend(bench_loads(api, args))
+        if args.only != 'loads':
+            results.extend(bench_renders(api, args))
+    finally:
+        api.stop()
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'args': vars(args),
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
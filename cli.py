@@ -0,0 +1,157 @@
+import argparse
+import csv
+import json
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, TextIO
+
+import spotipy
+from spotipy import Spotify, SpotifyClientCredentials, SpotifyException, SpotifyPKCE
+
+import data.spotify_content_extraction as content_extr
+import data.spotify_uri_utils as uri_utils
+from data.http_session import build_session
+from data.spotify_clients import SPOTIFY_CONNECT_TIMEOUT, SPOTIFY_POOL_SIZE, SPOTIFY_READ_TIMEOUT, SPOTIFY_RETRY_STATUSES, SPOTIFY_SCOPE
+from data.track_table import STRING_COLUMNS, NUMERIC_COLUMNS
+
+FORMAT_NDJSON = 'ndjson'
+FORMAT_CSV = 'csv'
+FIELDS = ('source', 'source_title') + STRING_COLUMNS + NUMERIC_COLUMNS
+
+DEFAULT_JOBS = 4
+DEFAULT_QUEUE_SIZE = 16
+
+SOURCE_DONE = object()
+
+
+def iter_sources(urls: list[str], files: list[TextIO]) -> Iterator[tuple[str, tuple[str, str]]]:
+    seen = set()
+    for line in iter_lines(urls, files):
+        for uri in uri_utils.find_spotify_uris(line):
+            source = uri_utils.parse_source(uri)
+            if source not in seen:
+                seen.add(source)
+                yield uri, source
+
+
+def iter_lines(urls: list[str], files: list[TextIO]) -> Iterator[str]:
+    yield from urls
+    for file in files:
+        yield from file
+
+
+def load_source(spotify: Spotify, uri: str, source: tuple[str, str], results: queue.Queue, stop: threading.Event):
+    try:
+        for event in content_extr.iter_content_source(spotify, *source):
+            if stop.is_set():
+                return
+            results.put((uri, event))
+    except Exception as e:
+        results.put((uri, e))
+    finally:
+        results.put((uri, SOURCE_DONE))
+
+
+def iter_results(spotify: Spotify, sources: Iterator[tuple[str, tuple[str, str]]], jobs: int, queue_size: int) -> Iterator[tuple[str, object]]:
+    results = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    running = 0
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        def submit_next() -> bool:
+            source = next(sources, None)
+            if source is None:
+                return False
+            executor.submit(load_source, spotify, *source, results, stop)
+            return True
+
+        try:
+            while running < jobs and submit_next():
+                running += 1
+            while running:
+                uri, item = results.get()
+                if item is SOURCE_DONE:
+                    running -= 1
+                    if submit_next():
+                        running += 1
+                    continue
+                yield uri, item
+        finally:
+            stop.set()
+            while running:
+                if results.get()[1] is SOURCE_DONE:
+                    running -= 1
+
+
+def write_rows(output: TextIO, output_format: str, rows: Iterator[dict]):
+    if output_format == FORMAT_CSV:
+        writer = csv.DictWriter(output, fieldnames=FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            output.flush()
+    else:
+        for row in rows:
+            output.write(json.dumps(row, separators=(',', ':')) + '\n')
+            output.flush()
+
+
+def iter_rows(results: Iterator[tuple[str, object]], errors: list[str]) -> Iterator[dict]:
+    for uri, item in results:
+        if isinstance(item, Exception):
+            errors.append(uri)
+            print(f'{uri}: {item.msg if isinstance(item, SpotifyException) else item}', file=sys.stderr)
+            continue
+        for track_data in item['tracks']:
+            row = {'source': uri, 'source_title': item['title']}
+            row.update(track_data)
+            yield row
+
+
+def create_spotify(auth: str) -> Spotify:
+    session = build_session(pool_size=SPOTIFY_POOL_SIZE, status_forcelist=SPOTIFY_RETRY_STATUSES)
+    timeout = (SPOTIFY_CONNECT_TIMEOUT, SPOTIFY_READ_TIMEOUT)
+    if auth == 'user':
+        auth_manager = SpotifyPKCE(scope=SPOTIFY_SCOPE, requests_session=session, requests_timeout=timeout)
+    else:
+        auth_manager = SpotifyClientCredentials(requests_session=session, requests_timeout=timeout)
+    return spotipy.Spotify(
+        auth_manager=auth_manager,
+        requests_session=session,
+        requests_timeout=timeout,
+        status_forcelist=SPOTIFY_RETRY_STATUSES
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Stream musical features of Spotify tracks, albums and playlists.')
+    parser.add_argument('urls', nargs='*', help='Spotify track, album or playlist URLs')
+    parser.add_argument('-f', '--file', action='append', default=[], type=argparse.FileType('r', encoding='utf-8'), help='file with URLs, "-" for stdin')
+    parser.add_argument('--format', choices=(FORMAT_NDJSON, FORMAT_CSV), default=FORMAT_NDJSON)
+    parser.add_argument('-o', '--output', type=argparse.FileType('w', encoding='utf-8'), default=sys.stdout, help='output file, stdout by default')
+    parser.add_argument('-j', '--jobs', type=int, default=DEFAULT_JOBS, help='sources loaded at the same time')
+    parser.add_argument('--auth', choices=('client', 'user'), default='client', help='client credentials, or user login for private playlists')
+    parser.add_argument('--no-cache', action='store_true', help='do not read or write the local track cache')
+    parser.add_argument('--no-library', action='store_true', help='do not add loaded tracks to the local track library')
+    args = parser.parse_args(argv)
+
+    if not args.urls and not args.file:
+        parser.error('no URLs given')
+    if args.no_cache:
+        content_extr.track_cache = None
+    if args.no_library:
+        content_extr.track_library = None
+
+    errors = list()
+    results = iter_results(create_spotify(args.auth), iter_sources(args.urls, args.file), args.jobs, DEFAULT_QUEUE_SIZE)
+    try:
+        write_rows(args.output, args.format, iter_rows(results, errors))
+    finally:
+        results.close()
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+DEFAULT_TTL = 60 * 60
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_SHARED_MAX_ENTRIES = 1024
+SHARED_TOUCH_INTERVAL = 60
+
+
+class ContentStore:
+    ttl: float
+    max_entries: int
+    path: Optional[str]
+    shared_max_entries: int
+    dumps: Optional[Callable[[Any], bytes]]
+    loads: Optional[Callable[[bytes], Any]]
+    _entries: OrderedDict
+    _lock: threading.Lock
+    _connection: Optional[sqlite3.Connection]
+
+    def __init__(
+            self,
+            ttl: float = DEFAULT_TTL,
+            max_entries: int = DEFAULT_MAX_ENTRIES,
+            path: Optional[str] = None,
+            shared_max_entries: int = DEFAULT_SHARED_MAX_ENTRIES,
+            dumps: Optional[Callable[[Any], bytes]] = None,
+            loads: Optional[Callable[[bytes], Any]] = None
+    ):
+        if path and (dumps is None or loads is None):
+            raise ValueError('Shared content needs dumps and loads functions.')
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self.shared_max_entries = shared_max_entries
+        self.dumps = dumps
+        self.loads = loads
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def put(self, content: Any) -> str:
+        handle = uuid.uuid4().hex
+        with self._lock:
+            now = time.monotonic()
+            self._entries[handle] = (now, content, now)
+            self._evict()
+            if self.path:
+                self._put_shared(handle, content)
+        return handle
+
+    def get(self, handle: str) -> Optional[Any]:
+        if not handle:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(handle)
+            if entry is not None and now - entry[0] > self.ttl:
+                del self._entries[handle]
+                entry = None
+            if entry is None:
+                content = self._get_shared(handle) if self.path else None
+                if content is not None:
+                    self._entries[handle] = (now, content, now)
+                    self._evict()
+                return content
+            _, content, touched = entry
+            if self.path and now - touched > SHARED_TOUCH_INTERVAL:
+                self._touch_shared(handle)
+                touched = now
+            self._entries[handle] = (now, content, touched)
+            self._entries.move_to_end(handle)
+            return content
+
+    def discard(self, handle: str):
+        with self._lock:
+            self._entries.pop(handle, None)
+            if self.path:
+                connection = self._connect()
+                connection.execute('DELETE FROM tables WHERE handle = ?', (handle,))
+                connection.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self):
+        now = time.monotonic()
+        while self._entries:
+            handle, (accessed, *_) = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_entries and now - accessed <= self.ttl:
+                break
+            del self._entries[handle]
+
+    def _put_shared(self, handle: str, content: Any):
+        now = time.time()
+        connection = self._connect()
+        connection.execute(
+            'INSERT INTO tables (handle, data, accessed) VALUES (?, ?, ?)',
+            (handle, self.dumps(content), now)
+        )
+        connection.execute('DELETE FROM tables WHERE accessed < ?', (now - self.ttl,))
+        connection.execute(
+            'DELETE FROM tables WHERE handle IN '
+            '(SELECT handle FROM tables ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+            (self.shared_max_entries,)
+        )
+        connection.commit()
+
+    def _get_shared(self, handle: str) -> Optional[Any]:
+        now = time.time()
+        connection = self._connect()
+        row = connection.execute(
+            'SELECT data FROM tables WHERE handle = ? AND accessed >= ?',
+            (handle, now - self.ttl)
+        ).fetchone()
+        if row is None:
+            return None
+        connection.execute('UPDATE tables SET accessed = ? WHERE handle = ?', (now, handle))
+        connection.commit()
+        return self.loads(row[0])
+
+    def _touch_shared(self, handle: str):
+        connection = self._connect()
+        connection.execute('UPDATE tables SET accessed = ? WHERE handle = ?', (time.time(), handle))
+        connection.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS tables '
+                '(handle TEXT PRIMARY KEY, data BLOB NOT NULL, accessed REAL NOT NULL)'
+            )
+            self._connection.execute('CREATE INDEX IF NOT EXISTS tables_accessed ON tables (accessed)')
+            self._connection.commit()
+        return self._connection
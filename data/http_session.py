@@ -0,0 +1,40 @@
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from data.request_scheduler import RATE_LIMITED_STATUS
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_HOST_POOLS = 4
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.3
+
+RETRY_METHODS = frozenset(['GET', 'POST', 'PUT', 'DELETE'])
+
+
+def build_session(
+        pool_size: int = DEFAULT_POOL_SIZE,
+        retries: int = DEFAULT_RETRIES,
+        status_forcelist: tuple[int, ...] = (),
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR
+) -> requests.Session:
+    session = requests.Session()
+
+    retry = urllib3.Retry(
+        total=retries,
+        connect=None,
+        read=False,
+        allowed_methods=RETRY_METHODS,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=tuple(status for status in status_forcelist if status != RATE_LIMITED_STATUS),
+        respect_retry_after_header=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=DEFAULT_HOST_POOLS,
+        pool_maxsize=pool_size,
+        max_retries=retry
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
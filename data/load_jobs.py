@@ -0,0 +1,244 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterator, Optional
+
+from spotipy import SpotifyException
+
+DEFAULT_MAX_JOBS = 64
+DEFAULT_FINISHED_TTL = 10 * 60
+PUBLISH_INTERVAL = 0.5
+PUBLISH_GROWTH = 2
+STATUS_INTERVAL = 0.5
+
+
+class LoadJob:
+    job_id: str
+    key: Optional[Hashable]
+    publish: Callable[[dict], str]
+    discard: Callable[[str], None]
+    title: Optional[str]
+    total: int
+    tracks: list[dict]
+    handle: Optional[str]
+    done: bool
+    error: Optional[str]
+    finished_at: Optional[float]
+    cancelled: threading.Event
+    waiters: int
+    remote_cancels: int
+    lock: threading.Lock
+    _published_at: float
+    _published_count: int
+    _reported_at: float
+
+    def __init__(self, job_id: str, publish: Callable[[dict], str], discard: Callable[[str], None], key: Optional[Hashable] = None):
+        self.job_id = job_id
+        self.key = key
+        self.publish = publish
+        self.discard = discard
+        self.title = None
+        self.total = 0
+        self.tracks = list()
+        self.handle = None
+        self.done = False
+        self.error = None
+        self.finished_at = None
+        self.cancelled = threading.Event()
+        self.waiters = 1
+        self.remote_cancels = 0
+        self.lock = threading.Lock()
+        self._published_at = 0.0
+        self._published_count = 0
+        self._reported_at = 0.0
+
+    def join(self) -> bool:
+        with self.lock:
+            if self.done or self.cancelled.is_set():
+                return False
+            self.waiters += 1
+            return True
+
+    def release(self, count: int = 1):
+        with self.lock:
+            self.waiters -= count
+            if self.waiters <= 0:
+                self.cancelled.set()
+
+    def status(self) -> dict:
+        with self.lock:
+            return {
+                'handle': self.handle,
+                'loaded': len(self.tracks),
+                'total': self.total,
+                'done': self.done,
+                'error': self.error
+            }
+
+    def run(self, events: Iterator[dict], on_update: Callable[['LoadJob'], None]):
+        try:
+            for event in events:
+                if self.cancelled.is_set():
+                    break
+                with self.lock:
+                    self.title = event['title']
+                    self.total = event['total']
+                    self.tracks.extend(event['tracks'])
+                    if event.get('errors'):
+                        self.error = '; '.join(filter(None, (self.error, *event['errors'])))
+                published = self._should_publish()
+                if published:
+                    self._publish()
+                if published or time.monotonic() - self._reported_at >= STATUS_INTERVAL:
+                    self._reported_at = time.monotonic()
+                    on_update(self)
+        except SpotifyException as e:
+            with self.lock:
+                self.error = e.msg
+        except Exception as e:
+            with self.lock:
+                self.error = str(e)
+        finally:
+            close = getattr(events, 'close', None)
+            if close:
+                close()
+            if not self.cancelled.is_set() and (self.tracks or self.error is None):
+                self._publish()
+            with self.lock:
+                self.done = True
+                self.finished_at = time.monotonic()
+            on_update(self)
+
+    def _should_publish(self) -> bool:
+        if time.monotonic() - self._published_at < PUBLISH_INTERVAL:
+            return False
+        with self.lock:
+            return len(self.tracks) >= PUBLISH_GROWTH * self._published_count
+
+    def _publish(self):
+        with self.lock:
+            content = {'title': self.title, 'tracks': list(self.tracks)}
+            self._published_count = len(self.tracks)
+        handle = self.publish(content)
+        with self.lock:
+            previous, self.handle = self.handle, handle
+        if previous:
+            self.discard(previous)
+        self._published_at = time.monotonic()
+
+
+class LoadJobs:
+    max_jobs: int
+    finished_ttl: float
+    path: Optional[str]
+    _jobs: OrderedDict
+    _keys: dict[Hashable, str]
+    _lock: threading.Lock
+    _connection: Optional[sqlite3.Connection]
+    _connection_lock: threading.Lock
+
+    def __init__(self, max_jobs: int = DEFAULT_MAX_JOBS, finished_ttl: float = DEFAULT_FINISHED_TTL, path: Optional[str] = None):
+        self.max_jobs = max_jobs
+        self.finished_ttl = finished_ttl
+        self.path = path
+        self._jobs = OrderedDict()
+        self._keys = dict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_lock = threading.Lock()
+
+    def start(self, load: Callable[[], Iterator[dict]], publish: Callable[[dict], str], discard: Callable[[str], None], key: Optional[Hashable] = None) -> str:
+        with self._lock:
+            self._evict()
+            running = self._jobs.get(self._keys.get(key)) if key else None
+            if running is not None and running.join():
+                return running.job_id
+            job = LoadJob(uuid.uuid4().hex, publish, discard, key)
+            self._jobs[job.job_id] = job
+            if key:
+                self._keys[key] = job.job_id
+        if self.path:
+            self._write_status(job)
+        threading.Thread(target=lambda: job.run(load(), self._on_update), daemon=True).start()
+        return job.job_id
+
+    def get(self, job_id: str) -> Optional[LoadJob]:
+        if not job_id:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id: str) -> Optional[dict]:
+        job = self.get(job_id)
+        if job is not None:
+            return job.status()
+        if self.path and job_id:
+            return self._read_status(job_id)
+        return None
+
+    def cancel(self, job_id: str):
+        job = self.get(job_id)
+        if job:
+            job.release()
+        elif self.path and job_id:
+            with self._connection_lock:
+                connection = self._connect()
+                connection.execute('UPDATE load_jobs SET cancelled = cancelled + 1 WHERE job_id = ?', (job_id,))
+                connection.commit()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def _on_update(self, job: LoadJob):
+        if self.path:
+            remote_cancels = self._write_status(job)
+            if remote_cancels > job.remote_cancels:
+                job.release(remote_cancels - job.remote_cancels)
+                job.remote_cancels = remote_cancels
+
+    def _write_status(self, job: LoadJob) -> int:
+        now = time.time()
+        with self._connection_lock:
+            connection = self._connect()
+            connection.execute(
+                'INSERT INTO load_jobs (job_id, status, cancelled, updated) VALUES (?, ?, 0, ?) '
+                'ON CONFLICT (job_id) DO UPDATE SET status = excluded.status, updated = excluded.updated',
+                (job.job_id, json.dumps(job.status()), now)
+            )
+            connection.execute('DELETE FROM load_jobs WHERE updated < ?', (now - self.finished_ttl,))
+            row = connection.execute('SELECT cancelled FROM load_jobs WHERE job_id = ?', (job.job_id,)).fetchone()
+            connection.commit()
+        return row[0] if row else 0
+
+    def _read_status(self, job_id: str) -> Optional[dict]:
+        with self._connection_lock:
+            row = self._connect().execute('SELECT status FROM load_jobs WHERE job_id = ?', (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS load_jobs '
+                '(job_id TEXT PRIMARY KEY, status TEXT NOT NULL, cancelled INTEGER NOT NULL, updated REAL NOT NULL)'
+            )
+            self._connection.commit()
+        return self._connection
+
+    def _evict(self):
+        now = time.monotonic()
+        for job_id, job in list(self._jobs.items()):
+            if job.done and now - job.finished_at > self.finished_ttl:
+                self._remove(job_id)
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_jobs + 1)]:
+            self._remove(job_id)
+
+    def _remove(self, job_id: str):
+        job = self._jobs.pop(job_id)
+        if job.key and self._keys.get(job.key) == job_id:
+            del self._keys[job.key]
@@ -0,0 +1,184 @@
+import functools
+import inspect
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Counter:
+    name: str
+    help: str
+    _values: dict[Labels, float]
+    _lock: threading.Lock
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values = dict()
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(label_key(labels), 0)
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            lines.extend(f'{self.name}{format_labels(key)} {format_value(value)}' for key, value in sorted(self._values.items()))
+        return lines
+
+
+class Histogram:
+    name: str
+    help: str
+    buckets: tuple[float, ...]
+    _values: dict[Labels, list]
+    _lock: threading.Lock
+
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self._values = dict()
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = label_key(labels)
+        with self._lock:
+            entry = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][idx] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(label_key(labels))
+            return entry[2] if entry else 0
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{format_labels(key + (("le", format_value(bound)),))} {bucket_count}')
+                lines.append(f'{self.name}_bucket{format_labels(key + (("le", "+Inf"),))} {count}')
+                lines.append(f'{self.name}_sum{format_labels(key)} {format_value(total)}')
+                lines.append(f'{self.name}_count{format_labels(key)} {count}')
+        return lines
+
+
+class GaugeFunction:
+    name: str
+    help: str
+    collect: Callable[[], Iterable[tuple[dict[str, str], float]]]
+
+    def __init__(self, name: str, help_text: str, collect: Callable[[], Iterable[tuple[dict[str, str], float]]]):
+        self.name = name
+        self.help = help_text
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} gauge']
+        lines.extend(f'{self.name}{format_labels(label_key(labels))} {format_value(value)}' for labels, value in self.collect())
+        return lines
+
+
+class Registry:
+    _metrics: dict[str, object]
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._metrics = dict()
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(name, lambda: Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(name, lambda: Histogram(name, help_text, buckets))
+
+    def gauge_function(self, name: str, help_text: str, collect: Callable[[], Iterable[tuple[dict[str, str], float]]]) -> GaugeFunction:
+        with self._lock:
+            self._metrics[name] = GaugeFunction(name, help_text, collect)
+            return self._metrics[name]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(line for metric in metrics for line in metric.render()) + '\n'
+
+    def _register(self, name: str, create: Callable):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = create()
+            return self._metrics[name]
+
+
+registry = Registry()
+
+extraction_calls = registry.counter('musicalify_extraction_calls_total', 'Calls of extraction functions by outcome.')
+extraction_seconds = registry.histogram('musicalify_extraction_seconds', 'Duration of extraction functions.')
+
+
+def timed(function: Callable) -> Callable:
+    name = function.__name__
+
+    if inspect.isgeneratorfunction(function):
+        @functools.wraps(function)
+        def generator_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            outcome = 'error'
+            try:
+                yield from function(*args, **kwargs)
+                outcome = 'ok'
+            except GeneratorExit:
+                outcome = 'cancelled'
+                raise
+            finally:
+                extraction_calls.inc(function=name, outcome=outcome)
+                extraction_seconds.observe(time.perf_counter() - start, function=name)
+        return generator_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        outcome = 'error'
+        try:
+            result = function(*args, **kwargs)
+            outcome = 'ok'
+            return result
+        finally:
+            extraction_calls.inc(function=name, outcome=outcome)
+            extraction_seconds.observe(time.perf_counter() - start, function=name)
+    return wrapper
+
+
+def label_key(labels: dict[str, str]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def format_labels(key: Labels) -> str:
+    if not key:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in key)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(key, escaped)) + '}'
+
+
+def format_value(value: Optional[float]) -> str:
+    if value is None:
+        return 'NaN'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
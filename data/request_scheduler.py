@@ -0,0 +1,99 @@
+import threading
+import time
+from typing import Any, Callable
+
+from spotipy import SpotifyException
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+PRIORITY_NAMES = ('interactive', 'bulk')
+
+DEFAULT_RATE = 20.0
+DEFAULT_BURST = 40
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_RETRY_AFTER = 1.0
+
+RATE_LIMITED_STATUS = 429
+
+
+class RequestScheduler:
+    rate: float
+    burst: int
+    max_retries: int
+    calls: int
+    throttled: int
+    _tokens: float
+    _refilled_at: float
+    _paused_until: float
+    _waiting: list[int]
+    _condition: threading.Condition
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST, max_retries: int = DEFAULT_MAX_RETRIES):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.calls = 0
+        self.throttled = 0
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting = [0] * len(PRIORITY_NAMES)
+        self._condition = threading.Condition()
+
+    def call(self, fn: Callable, *args, priority: int = PRIORITY_BULK, **kwargs) -> Any:
+        attempt = 0
+        while True:
+            self._acquire(priority)
+            try:
+                return fn(*args, **kwargs)
+            except SpotifyException as e:
+                if e.http_status != RATE_LIMITED_STATUS or attempt >= self.max_retries:
+                    raise
+                self._pause(retry_after(e))
+                attempt += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._condition:
+            return {
+                'queued': {PRIORITY_NAMES[priority]: count for priority, count in enumerate(self._waiting)},
+                'calls': self.calls,
+                'throttled': self.throttled,
+                'tokens': self._tokens,
+                'paused_for': max(self._paused_until - time.monotonic(), 0.0)
+            }
+
+    def _acquire(self, priority: int):
+        with self._condition:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    preceded = any(self._waiting[higher] for higher in range(priority))
+                    if not preceded and now >= self._paused_until and self._tokens >= 1:
+                        self._tokens -= 1
+                        self.calls += 1
+                        return
+                    self._condition.wait(max(self._paused_until - now, (1 - self._tokens) / self.rate, 0.001))
+            finally:
+                self._waiting[priority] -= 1
+                self._condition.notify_all()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _pause(self, seconds: float):
+        with self._condition:
+            self.throttled += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+def retry_after(e: SpotifyException) -> float:
+    if e.headers and 'Retry-After' in e.headers:
+        try:
+            return float(e.headers['Retry-After'])
+        except ValueError:
+            pass
+    return DEFAULT_RETRY_AFTER
@@ -0,0 +1,100 @@
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+
+import requests
+from spotipy import Spotify, SpotifyPKCE
+
+from data.spotify_content_extraction import MAX_FETCH_WORKERS
+from data.token_store import TokenStore, SessionCacheHandler, VERIFIER_KEY
+
+DEFAULT_MAX_CLIENTS = 256
+SPOTIFY_RETRY_STATUSES = (500, 502, 503, 504)
+SPOTIFY_POOL_SIZE = MAX_FETCH_WORKERS * 2
+SPOTIFY_CONNECT_TIMEOUT = 3.05
+SPOTIFY_READ_TIMEOUT = 10.0
+SPOTIFY_SCOPE = 'user-modify-playback-state,playlist-read-private'
+
+
+class SharedSessionSpotify(Spotify):
+    def __del__(self):
+        pass
+
+
+class SharedSessionSpotifyPKCE(SpotifyPKCE):
+    def __del__(self):
+        pass
+
+
+class SpotifyClients:
+    token_store: TokenStore
+    session: requests.Session
+    scope: str
+    requests_timeout: tuple[float, float]
+    status_forcelist: tuple[int, ...]
+    max_clients: int
+    _clients: OrderedDict
+    _lock: threading.Lock
+
+    def __init__(
+            self,
+            token_store: TokenStore,
+            session: requests.Session,
+            scope: str,
+            requests_timeout: tuple[float, float],
+            status_forcelist: tuple[int, ...],
+            max_clients: int = DEFAULT_MAX_CLIENTS
+    ):
+        self.token_store = token_store
+        self.session = session
+        self.scope = scope
+        self.requests_timeout = requests_timeout
+        self.status_forcelist = status_forcelist
+        self.max_clients = max_clients
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> tuple[Spotify, SpotifyPKCE]:
+        with self._lock:
+            client = self._clients.get(session_id)
+            if client is not None:
+                self._clients.move_to_end(session_id)
+                return client
+
+        client = self._create(session_id)
+        with self._lock:
+            client = self._clients.setdefault(session_id, client)
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        return client
+
+    def _create(self, session_id: str) -> tuple[Spotify, SpotifyPKCE]:
+        auth_manager = SharedSessionSpotifyPKCE(
+            scope=self.scope,
+            cache_handler=SessionCacheHandler(self.token_store, session_id),
+            requests_session=self.session,
+            requests_timeout=self.requests_timeout,
+            open_browser=False
+        )
+
+        code_verifier = self.token_store.get(session_id, VERIFIER_KEY)
+        if code_verifier:
+            auth_manager.code_verifier = code_verifier
+            auth_manager.code_challenge = code_challenge(code_verifier)
+        else:
+            auth_manager.get_pkce_handshake_parameters()
+            self.token_store.put(session_id, VERIFIER_KEY, auth_manager.code_verifier)
+
+        spotify = SharedSessionSpotify(
+            auth_manager=auth_manager,
+            requests_session=self.session,
+            requests_timeout=self.requests_timeout,
+            status_forcelist=self.status_forcelist
+        )
+        return spotify, auth_manager
+
+
+def code_challenge(code_verifier: str) -> str:
+    digest = hashlib.sha256(code_verifier.encode('utf-8')).digest()
+    return base64.urlsafe_b64encode(digest).decode('utf-8').replace('=', '')
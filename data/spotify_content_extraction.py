@@ -1,53 +1,260 @@
-from typing import Any
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
 
-from spotipy import Spotify
+from spotipy import Spotify, SpotifyException
 
+from data.metrics import timed
+from data.request_scheduler import RequestScheduler, PRIORITY_BULK, PRIORITY_INTERACTIVE
+from data.single_flight import SingleFlight
+from data.track_cache import TrackCache, FEATURES_TABLE, TRACKS_TABLE
+from data.track_library import TrackLibrary
 from ui.layout.layout import IMG_SIZE
 
 MAX_TRACK_REQ_NO = 50
 MAX_FEATURE_REQ_NO = 100
+MAX_FETCH_WORKERS = 8
+PLAYLIST_PAGE_SIZE = 100
+ALBUM_PAGE_SIZE = 50
 
+SOURCE_TRACK = 'track'
+SOURCE_ALBUM = 'album'
+SOURCE_PLAYLIST = 'playlist'
 
+PLAYLIST_ITEMS_FIELDS = 'items(track(id,uri,name,artists(name),album(images))),offset,limit,total,next'
+FEATURE_KEYS = ('tempo', 'acousticness', 'danceability', 'energy', 'instrumentalness', 'valence')
+
+track_cache: Optional[TrackCache] = TrackCache()
+track_library: Optional[TrackLibrary] = TrackLibrary()
+single_flight = SingleFlight()
+scheduler = RequestScheduler()
+
+
+@timed
 def get_content_track(spotify: Spotify, track_id: str) -> dict:
-    track = get_tracks(spotify, [track_id])[0]
-    features = get_features(spotify, [track_id])[0]
-    return {
-        'title': None,
-        'tracks': [extract_data(track, features)]
-    }
+    return single_flight.do(('track', track_id), lambda: load_content_track(spotify, track_id))
 
 
+@timed
 def get_content_album(spotify: Spotify, album_id: str) -> dict:
-    album_tracks = get_album_tracks(spotify, album_id)
-    album = spotify.album(album_id)
-    return {
-        'title': album['name'],
-        'tracks': get_content_tracks(spotify, album_tracks, choose_image_url(album['images']))
-    }
+    return single_flight.do(('album', album_id), lambda: load_content_album(spotify, album_id))
 
 
+@timed
 def get_content_playlist(spotify: Spotify, playlist_id: str) -> dict:
-    playlist_tracks = get_playlist_tracks(spotify, playlist_id)
-    playlist = spotify.playlist(playlist_id)
+    return single_flight.do(('playlist', playlist_id), lambda: load_content_playlist(spotify, playlist_id))
+
+
+@timed
+def get_track_features(spotify: Spotify, track_id: str) -> Optional[dict]:
+    return fetch_cached(
+        FEATURES_TABLE,
+        [track_id],
+        lambda track_ids: fetch_features_chunk(spotify, track_ids, priority=PRIORITY_INTERACTIVE)
+    )[0]
+
+
+def load_content_track(spotify: Spotify, track_id: str) -> dict:
     return {
-        'title': playlist['name'],
-        'tracks': get_content_tracks(spotify, playlist_tracks)
+        'title': None,
+        'tracks': get_enriched_tracks(spotify, [track_id], priority=PRIORITY_INTERACTIVE)
     }
 
 
-def get_content_tracks(spotify: Spotify, tracks: list[dict], img_url=None) -> list[dict]:
+def load_content_album(spotify: Spotify, album_id: str) -> dict:
+    return collect_content(iter_content_album(spotify, album_id))
+
+
+def load_content_playlist(spotify: Spotify, playlist_id: str) -> dict:
+    return collect_content(iter_content_playlist(spotify, playlist_id))
+
+
+@timed
+def iter_content_album(spotify: Spotify, album_id: str) -> Iterator[dict]:
+    album = scheduler.call(spotify.album, album_id)
+    img_url = choose_image_url(album['images'])
+    for total, tracks in iter_enriched_pages(spotify, iter_album_pages(spotify, album_id), dict(), img_url):
+        yield {'title': album['name'], 'total': total, 'tracks': tracks}
+
+
+@timed
+def iter_content_playlist(spotify: Spotify, playlist_id: str) -> Iterator[dict]:
+    playlist = scheduler.call(spotify.playlist, playlist_id, fields='name,snapshot_id')
+    stored = track_cache.get_playlist(playlist_id, playlist['snapshot_id']) if track_cache else None
+    if stored and stored['snapshot_id'] == playlist['snapshot_id']:
+        tracks = stored['content']['tracks']
+        yield {'title': playlist['name'], 'total': len(tracks), 'tracks': tracks}
+        return
+
+    known_tracks = dict()
+    if stored:
+        known_tracks = {track_data['track_id']: track_data for track_data in stored['content']['tracks']}
+
+    content = {'title': playlist['name'], 'tracks': list()}
+    for total, tracks in iter_enriched_pages(spotify, iter_playlist_pages(spotify, playlist_id), known_tracks):
+        content['tracks'].extend(tracks)
+        yield {'title': playlist['name'], 'total': total, 'tracks': tracks}
+
+    if track_cache:
+        track_cache.put_playlist(playlist_id, playlist['snapshot_id'], content)
+
+
+@timed
+def iter_content_batch(spotify: Spotify, sources: list[tuple[str, str]]) -> Iterator[dict]:
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        futures = [(source, executor.submit(get_source_tracks, spotify, *source)) for source in dict.fromkeys(sources)]
+        listings = list()
+        errors = list()
+        for (kind, source_id), future in futures:
+            try:
+                listings.append(future.result())
+            except SpotifyException as e:
+                errors.append(f'{source_url(kind, source_id)}: {e.msg}')
+
+        title = ', '.join(listing['title'] for listing in listings if listing['title']) or None
+        unique_tracks = dict()
+        known_tracks = dict()
+        for listing in listings:
+            known_tracks.update(listing['known_tracks'])
+            for track, img_url in listing['tracks']:
+                if track is not None and track['uri'] not in unique_tracks:
+                    unique_tracks[track['uri']] = (track, img_url)
+
+        chunks = split_chunks(list(unique_tracks.values()), MAX_FEATURE_REQ_NO)
+        futures = [
+            executor.submit(get_features, spotify, [track['id'] for track, _ in chunk if track['uri'] not in known_tracks], 1)
+            for chunk in chunks
+        ]
+        if errors and not chunks:
+            yield {'title': title, 'total': 0, 'tracks': list(), 'errors': errors}
+        for chunk, future in zip(chunks, futures):
+            new_chunk = [(track, img_url) for track, img_url in chunk if track['uri'] not in known_tracks]
+            enriched = [extract_data(track, features, img_url) for (track, img_url), features in zip(new_chunk, future.result())]
+            record_tracks(enriched)
+            known_tracks.update((track_data['track_id'], track_data) for track_data in enriched)
+            event = {'title': title, 'total': len(unique_tracks), 'tracks': [known_tracks[track['uri']] for track, _ in chunk]}
+            if errors:
+                event['errors'], errors = errors, list()
+            yield event
+
+        if track_cache:
+            for listing in listings:
+                if listing['snapshot_id']:
+                    tracks = [known_tracks[track['uri']] for track, _ in listing['tracks'] if track is not None]
+                    track_cache.put_playlist(listing['playlist_id'], listing['snapshot_id'], {'title': listing['title'], 'tracks': tracks})
+
+
+def iter_content_source(spotify: Spotify, kind: str, source_id: str) -> Iterator[dict]:
+    if kind == SOURCE_TRACK:
+        yield {'title': None, 'total': 1, 'tracks': get_enriched_tracks(spotify, [source_id])}
+    elif kind == SOURCE_ALBUM:
+        yield from iter_content_album(spotify, source_id)
+    elif kind == SOURCE_PLAYLIST:
+        yield from iter_content_playlist(spotify, source_id)
+    else:
+        raise ValueError(f'Unknown source kind: {kind}')
+
+
+def get_source_tracks(spotify: Spotify, kind: str, source_id: str) -> dict:
+    listing = {'title': None, 'tracks': list(), 'known_tracks': dict(), 'playlist_id': None, 'snapshot_id': None}
+    if kind == SOURCE_TRACK:
+        listing['tracks'] = [(track, None) for track in get_tracks(spotify, [source_id], 1)]
+    elif kind == SOURCE_ALBUM:
+        album = scheduler.call(spotify.album, source_id)
+        img_url = choose_image_url(album['images'])
+        listing['title'] = album['name']
+        listing['tracks'] = [(track, img_url) for track in get_album_tracks(spotify, source_id)]
+    elif kind == SOURCE_PLAYLIST:
+        playlist = scheduler.call(spotify.playlist, source_id, fields='name,snapshot_id')
+        listing['title'] = playlist['name']
+        stored = track_cache.get_playlist(source_id, playlist['snapshot_id']) if track_cache else None
+        if stored:
+            listing['known_tracks'] = {track_data['track_id']: track_data for track_data in stored['content']['tracks']}
+        if stored and stored['snapshot_id'] == playlist['snapshot_id']:
+            listing['tracks'] = [({'uri': track_data['track_id']}, None) for track_data in stored['content']['tracks']]
+        else:
+            listing['tracks'] = [(track, None) for track in get_playlist_tracks(spotify, source_id)]
+            listing['playlist_id'] = source_id
+            listing['snapshot_id'] = playlist['snapshot_id']
+    else:
+        raise ValueError(f'Unknown source kind: {kind}')
+    return listing
+
+
+def source_url(kind: str, source_id: str) -> str:
+    return f'https://open.spotify.com/{kind}/{source_id}'
+
+
+def iter_enriched_pages(spotify: Spotify, pages: Iterator[tuple[int, list[dict]]], known_tracks: dict[str, dict], img_url=None) -> Iterator[tuple[int, list[dict]]]:
+    def resolve(total: int, tracks: list[dict], future: Future) -> tuple[int, list[dict]]:
+        enriched = {track_data['track_id']: track_data for track_data in future.result()}
+        return total, [known_tracks[track['uri']] if track['uri'] in known_tracks else enriched[track['uri']] for track in tracks]
+
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        pending = deque()
+        for total, tracks in pages:
+            tracks = [track for track in tracks if track is not None]
+            new_tracks = [track for track in tracks if track['uri'] not in known_tracks]
+            pending.append((total, tracks, executor.submit(get_content_tracks, spotify, new_tracks, img_url, 1)))
+            while pending and pending[0][2].done():
+                yield resolve(*pending.popleft())
+        while pending:
+            yield resolve(*pending.popleft())
+
+
+def collect_content(events: Iterator[dict]) -> dict:
+    content = {'title': None, 'tracks': list()}
+    for event in events:
+        content['title'] = event['title']
+        content['tracks'].extend(event['tracks'])
+    return content
+
+
+def get_content_tracks(spotify: Spotify, tracks: list[dict], img_url=None, max_workers: int = MAX_FETCH_WORKERS) -> list[dict]:
     if not tracks:
         return list()
 
-    features = get_features(spotify, [track['id'] for track in tracks])
+    features = get_features(spotify, [track['id'] for track in tracks], max_workers)
 
     result = list()
     for idx in range(len(tracks)):
         result.append(extract_data(tracks[idx], features[idx], img_url))
 
+    record_tracks(result)
+    return result
+
+
+def get_enriched_tracks(spotify: Spotify, track_ids: list[str], img_url=None, max_workers: int = MAX_FETCH_WORKERS, priority: int = PRIORITY_BULK) -> list[dict]:
+    result = list()
+    for chunk in iter_enriched_tracks(spotify, track_ids, img_url, max_workers, priority):
+        result.extend(chunk)
     return result
 
 
+def iter_enriched_tracks(spotify: Spotify, track_ids: list[str], img_url=None, max_workers: int = MAX_FETCH_WORKERS, priority: int = PRIORITY_BULK) -> Iterator[list[dict]]:
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = list()
+        for chunk in split_chunks(track_ids, MAX_FEATURE_REQ_NO):
+            features_future = executor.submit(fetch_cached, FEATURES_TABLE, chunk, lambda ids: fetch_features_chunk(spotify, ids, priority))
+            track_futures = [
+                executor.submit(fetch_cached, TRACKS_TABLE, track_chunk, lambda ids: fetch_tracks_chunk(spotify, ids, priority))
+                for track_chunk in split_chunks(chunk, MAX_TRACK_REQ_NO)
+            ]
+            pending.append((features_future, track_futures))
+
+        for features_future, track_futures in pending:
+            features = features_future.result()
+            tracks = [track for future in track_futures for track in future.result()]
+            result = [extract_data(tracks[idx], features[idx], img_url) for idx in range(len(tracks))]
+            record_tracks(result)
+            yield result
+
+
+def record_tracks(tracks: list[dict]):
+    if track_library is not None:
+        track_library.add(tracks)
+
+
 def extract_data(track: dict, features: dict, img_url=None):
     track_data = dict()
     track_data['title'] = track['name']
@@ -63,58 +270,145 @@ def extract_data(track: dict, features: dict, img_url=None):
     return track_data
 
 
-def get_tracks(spotify: Spotify, track_ids: list[str]):
-    num_of_full_requests = int(len(track_ids) / MAX_TRACK_REQ_NO)
+@timed
+def get_tracks(spotify: Spotify, track_ids: list[str], max_workers: int = MAX_FETCH_WORKERS):
+    return fetch_cached(
+        TRACKS_TABLE,
+        track_ids,
+        lambda ids: fetch_chunked(lambda chunk: fetch_tracks_chunk(spotify, chunk), ids, MAX_TRACK_REQ_NO, max_workers)
+    )
 
-    result = list()
-    for idx in range(num_of_full_requests):
-        tracks = spotify.tracks(track_ids[idx * MAX_TRACK_REQ_NO:(idx + 1) * MAX_TRACK_REQ_NO])
-        result.extend(tracks['tracks'])
-    missing_track_ids = track_ids[num_of_full_requests * MAX_TRACK_REQ_NO:]
-    if missing_track_ids:
-        tracks = spotify.tracks(missing_track_ids)
-        result.extend(tracks['tracks'])
 
-    return result
+@timed
+def get_features(spotify: Spotify, track_ids: list[str], max_workers: int = MAX_FETCH_WORKERS):
+    return fetch_cached(
+        FEATURES_TABLE,
+        track_ids,
+        lambda ids: fetch_chunked(lambda chunk: fetch_features_chunk(spotify, chunk), ids, MAX_FEATURE_REQ_NO, max_workers)
+    )
 
 
-def get_features(spotify: Spotify, track_ids: list[str]):
-    num_of_full_requests = int(len(track_ids) / MAX_FEATURE_REQ_NO)
+def fetch_cached(table: str, track_ids: list[str], fetch: Callable[[list[str]], list[dict]]) -> list[dict]:
+    if track_cache is None:
+        return fetch(track_ids)
 
-    result = list()
-    for idx in range(num_of_full_requests):
-        features = spotify.audio_features(track_ids[idx * MAX_FEATURE_REQ_NO:(idx + 1) * MAX_FEATURE_REQ_NO])
-        result.extend(features)
-    missing_track_ids = track_ids[num_of_full_requests * MAX_FEATURE_REQ_NO:]
+    cached = track_cache.get_many(table, track_ids)
+    missing_track_ids = [track_id for track_id in dict.fromkeys(track_ids) if track_id not in cached]
     if missing_track_ids:
-        features = spotify.audio_features(missing_track_ids)
-        result.extend(features)
+        fetched = {
+            track_id: item
+            for track_id, item in zip(missing_track_ids, fetch(missing_track_ids))
+            if item is not None
+        }
+        track_cache.put_many(table, fetched)
+        cached.update(fetched)
+
+    return [cached.get(track_id) for track_id in track_ids]
+
+
+@timed
+def fetch_tracks_chunk(spotify: Spotify, track_ids: list[str], priority: int = PRIORITY_BULK) -> list[dict]:
+    return single_flight.do(
+        ('tracks', tuple(track_ids)),
+        lambda: [project_track(track) for track in scheduler.call(spotify.tracks, track_ids, priority=priority)['tracks']]
+    )
+
+
+@timed
+def fetch_features_chunk(spotify: Spotify, track_ids: list[str], priority: int = PRIORITY_BULK) -> list[dict]:
+    return single_flight.do(
+        ('features', tuple(track_ids)),
+        lambda: [project_features(features) for features in scheduler.call(spotify.audio_features, track_ids, priority=priority)]
+    )
+
+
+def project_track(track: Optional[dict]) -> Optional[dict]:
+    if track is None:
+        return None
+    projected = {
+        'id': track['id'],
+        'uri': track['uri'],
+        'name': track['name'],
+        'artists': [{'name': artist['name']} for artist in track['artists']]
+    }
+    if 'album' in track:
+        img_url = choose_image_url(track['album']['images'])
+        projected['album'] = {'images': [{'url': img_url, 'height': IMG_SIZE}] if img_url else []}
+    return projected
+
 
+def project_features(features: Optional[dict]) -> Optional[dict]:
+    if features is None:
+        return None
+    return {key: features[key] for key in FEATURE_KEYS}
+
+
+def fetch_chunked(fetch_chunk: Callable[[list[str]], list[dict]], ids: list[str], chunk_size: int, max_workers: int = MAX_FETCH_WORKERS) -> list[dict]:
+    chunks = split_chunks(ids, chunk_size)
+    if len(chunks) <= 1:
+        return [item for chunk in chunks for item in fetch_chunk(chunk)]
+
+    result = list()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for items in executor.map(fetch_chunk, chunks):
+            result.extend(items)
     return result
 
 
-def get_playlist_tracks(spotify: Spotify, playlist_id: str) -> list[dict]:
-    offset = 0
-    tracks = list()
-    while True:
-        items_info = spotify.playlist_items(playlist_id, offset=offset)
-        tracks.extend(item['track'] for item in items_info['items'])
-        if items_info['next'] is None:
-            break
-        offset = items_info['offset'] + len(items_info['items'])
-    return tracks
+def split_chunks(items: list, chunk_size: int) -> list[list]:
+    return [items[idx:idx + chunk_size] for idx in range(0, len(items), chunk_size)]
+
 
+def get_playlist_tracks(spotify: Spotify, playlist_id: str, parallel: bool = True) -> list[dict]:
+    return [track for _, tracks in iter_playlist_pages(spotify, playlist_id, parallel) for track in tracks]
 
-def get_album_tracks(spotify: Spotify, album_id: str) -> list[dict]:
-    offset = 0
-    tracks = list()
-    while True:
-        items_info = spotify.album_tracks(album_id, offset=offset)
-        tracks.extend(items_info['items'])
-        if items_info['next'] is None:
-            break
-        offset = items_info['offset'] + len(items_info['items'])
-    return tracks
+
+def get_album_tracks(spotify: Spotify, album_id: str, parallel: bool = True) -> list[dict]:
+    return [track for _, tracks in iter_album_pages(spotify, album_id, parallel) for track in tracks]
+
+
+def iter_playlist_pages(spotify: Spotify, playlist_id: str, parallel: bool = True) -> Iterator[tuple[int, list[dict]]]:
+    pages = iter_paged_items(
+        lambda offset: scheduler.call(
+            spotify.playlist_items, playlist_id, fields=PLAYLIST_ITEMS_FIELDS, limit=PLAYLIST_PAGE_SIZE, offset=offset
+        ),
+        parallel
+    )
+    for page in pages:
+        yield page['total'], [project_track(item['track']) for item in page['items']]
+
+
+def iter_album_pages(spotify: Spotify, album_id: str, parallel: bool = True) -> Iterator[tuple[int, list[dict]]]:
+    pages = iter_paged_items(
+        lambda offset: scheduler.call(spotify.album_tracks, album_id, limit=ALBUM_PAGE_SIZE, offset=offset),
+        parallel
+    )
+    for page in pages:
+        yield page['total'], [project_track(track) for track in page['items']]
+
+
+def iter_paged_items(fetch_page: Callable[[int], dict], parallel: bool = True) -> Iterator[dict]:
+    items_info = fetch_page(0)
+    yield items_info
+    if items_info['next'] is None:
+        return
+
+    if not parallel:
+        while items_info['next'] is not None:
+            items_info = fetch_page(items_info['offset'] + len(items_info['items']))
+            yield items_info
+        return
+
+    offsets = range(items_info['offset'] + len(items_info['items']), items_info['total'], items_info['limit'])
+    executor = ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS)
+    futures = [executor.submit(fetch_page, offset) for offset in offsets]
+    try:
+        for future in futures:
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown()
 
 
 def choose_image_url(images: list[dict], min_height: int = IMG_SIZE) -> str:
@@ -133,11 +427,3 @@ def filter_tempo(filter_settings: dict[str, float], tempo) -> bool:
         if 'smaller' in filter_settings and tempo > filter_settings['smaller']:
             return False
     return True
-
-
-def correct_tempo(double_smaller: float, half_greater: float, tempo) -> Any:
-    if tempo < double_smaller:
-        return tempo * 2
-    if tempo > half_greater:
-        return tempo / 2
-    return tempo
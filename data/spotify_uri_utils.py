@@ -1,8 +1,13 @@
+import re
+
 SPOTIFY_URI_START = 'https://open.spotify.com/'
 TRACK_IDENTIFIER = '/track/'
 ALBUM_IDENTIFIER = '/album/'
 PLAYLIST_IDENTIFIER = '/playlist/'
 PARAMETER_IDENTIFIER = '?'
+TRACK_URI_PREFIX = 'spotify:track:'
+
+SPOTIFY_URI_PATTERN = re.compile(r'https://open\.spotify\.com/(?:[\w-]+/)?(?:track|album|playlist)/[A-Za-z0-9]+')
 
 
 def is_spotify_uri(uri: str) -> bool:
@@ -30,6 +35,12 @@ def parse_track_uri(uri: str):
     return uri[start + len(TRACK_IDENTIFIER):end]
 
 
+def parse_track_id(track_uri: str) -> str:
+    if track_uri.startswith(TRACK_URI_PREFIX):
+        return track_uri[len(TRACK_URI_PREFIX):]
+    return track_uri
+
+
 def parse_album_uri(uri: str):
     start = uri.index(ALBUM_IDENTIFIER)
     if PARAMETER_IDENTIFIER in uri:
@@ -46,3 +57,15 @@ def parse_playlist_uri(uri: str):
     else:
         end = len(uri)
     return uri[start + len(PLAYLIST_IDENTIFIER):end]
+
+
+def find_spotify_uris(text: str) -> list[str]:
+    return list(dict.fromkeys(SPOTIFY_URI_PATTERN.findall(text)))
+
+
+def parse_source(uri: str) -> tuple[str, str]:
+    if is_track_uri(uri):
+        return 'track', parse_track_uri(uri)
+    if is_album_uri(uri):
+        return 'album', parse_album_uri(uri)
+    return 'playlist', parse_playlist_uri(uri)
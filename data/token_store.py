@@ -0,0 +1,136 @@
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Optional, Union
+
+from spotipy import CacheHandler
+
+DEFAULT_TOKEN_DB_PATH = '.musicalify-tokens.sqlite'
+DEFAULT_TOKEN_DIR = '.musicalify-tokens'
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+
+TOKEN_KEY = 'token'
+VERIFIER_KEY = 'code_verifier'
+
+SESSION_ID_PATTERN = re.compile(r'[0-9a-f]{32}')
+
+
+class SQLiteTokenStore:
+    path: str
+    max_age: float
+    _connection: Optional[sqlite3.Connection]
+    _lock: threading.Lock
+
+    def __init__(self, path: str = DEFAULT_TOKEN_DB_PATH, max_age: float = DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT data FROM tokens WHERE session_id = ? AND key = ?',
+                (session_id, key)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, session_id: str, key: str, value: Any):
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                'INSERT OR REPLACE INTO tokens (session_id, key, data, updated) VALUES (?, ?, ?, ?)',
+                (session_id, key, json.dumps(value), now)
+            )
+            connection.execute('DELETE FROM tokens WHERE updated < ?', (now - self.max_age,))
+            connection.commit()
+
+    def delete(self, session_id: str):
+        with self._lock:
+            connection = self._connect()
+            connection.execute('DELETE FROM tokens WHERE session_id = ?', (session_id,))
+            connection.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS tokens '
+                '(session_id TEXT NOT NULL, key TEXT NOT NULL, data TEXT NOT NULL, updated REAL NOT NULL, '
+                'PRIMARY KEY (session_id, key))'
+            )
+            self._connection.commit()
+        return self._connection
+
+
+class FileTokenStore:
+    directory: str
+    max_age: float
+
+    def __init__(self, directory: str = DEFAULT_TOKEN_DIR, max_age: float = DEFAULT_MAX_AGE):
+        self.directory = directory
+        self.max_age = max_age
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def get(self, session_id: str, key: str) -> Optional[Any]:
+        try:
+            with open(self._file(session_id, key), encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def put(self, session_id: str, key: str, value: Any):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(value, file)
+            os.replace(temp_path, self._file(session_id, key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._evict()
+
+    def delete(self, session_id: str):
+        for key in (TOKEN_KEY, VERIFIER_KEY):
+            try:
+                os.unlink(self._file(session_id, key))
+            except FileNotFoundError:
+                pass
+
+    def _file(self, session_id: str, key: str) -> str:
+        if not SESSION_ID_PATTERN.fullmatch(session_id):
+            raise ValueError(f'Invalid session id: {session_id!r}')
+        return os.path.join(self.directory, f'{session_id}.{key}.json')
+
+    def _evict(self):
+        expired = time.time() - self.max_age
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.stat().st_mtime < expired:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+TokenStore = Union[SQLiteTokenStore, FileTokenStore]
+
+
+class SessionCacheHandler(CacheHandler):
+    store: TokenStore
+    session_id: str
+
+    def __init__(self, store: TokenStore, session_id: str):
+        self.store = store
+        self.session_id = session_id
+
+    def get_cached_token(self) -> Optional[dict]:
+        return self.store.get(self.session_id, TOKEN_KEY)
+
+    def save_token_to_cache(self, token_info: dict):
+        self.store.put(self.session_id, TOKEN_KEY, token_info)
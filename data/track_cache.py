@@ -0,0 +1,159 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+DEFAULT_CACHE_PATH = '.musicalify-cache.sqlite'
+DEFAULT_MAX_ENTRIES = 250000
+DEFAULT_MAX_PLAYLISTS = 200
+EVICT_SLACK = 0.1
+
+FEATURES_TABLE = 'features'
+TRACKS_TABLE = 'tracks'
+PLAYLISTS_TABLE = 'playlists'
+TABLES = (FEATURES_TABLE, TRACKS_TABLE)
+
+MAX_SQL_PARAMS = 500
+
+
+class TrackCache:
+    path: str
+    max_entries: int
+    max_playlists: int
+    hits: dict[str, int]
+    misses: dict[str, int]
+    _connection: Optional[sqlite3.Connection]
+    _lock: threading.Lock
+    _counts: dict[str, int]
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES, max_playlists: int = DEFAULT_MAX_PLAYLISTS):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_playlists = max_playlists
+        self.hits = {table: 0 for table in TABLES + (PLAYLISTS_TABLE,)}
+        self.misses = {table: 0 for table in TABLES + (PLAYLISTS_TABLE,)}
+        self._connection = None
+        self._lock = threading.Lock()
+        self._counts = dict()
+
+    def get_many(self, table: str, track_ids: list[str]) -> dict[str, dict]:
+        unique_ids = list(dict.fromkeys(track_ids))
+        result = dict()
+        with self._lock:
+            connection = self._connect()
+            for idx in range(0, len(unique_ids), MAX_SQL_PARAMS):
+                chunk = unique_ids[idx:idx + MAX_SQL_PARAMS]
+                placeholders = ','.join('?' * len(chunk))
+                rows = connection.execute(
+                    f'SELECT track_id, data FROM {table} WHERE track_id IN ({placeholders})',
+                    chunk
+                ).fetchall()
+                result.update((track_id, json.loads(data)) for track_id, data in rows)
+            if result:
+                now = time.time()
+                connection.executemany(
+                    f'UPDATE {table} SET accessed = ? WHERE track_id = ?',
+                    [(now, track_id) for track_id in result]
+                )
+                connection.commit()
+            self.hits[table] += len(result)
+            self.misses[table] += len(unique_ids) - len(result)
+        return result
+
+    def put_many(self, table: str, items: dict[str, dict]):
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.executemany(
+                f'INSERT OR REPLACE INTO {table} (track_id, data, accessed) VALUES (?, ?, ?)',
+                [(track_id, json.dumps(item, separators=(',', ':')), now) for track_id, item in items.items()]
+            )
+            self._evict(connection, table, self.max_entries, len(items))
+            connection.commit()
+
+    def get_playlist(self, playlist_id: str, snapshot_id: str) -> Optional[dict]:
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                f'SELECT snapshot_id, data FROM {PLAYLISTS_TABLE} WHERE playlist_id = ?',
+                (playlist_id,)
+            ).fetchone()
+            if row and row[0] == snapshot_id:
+                connection.execute(
+                    f'UPDATE {PLAYLISTS_TABLE} SET accessed = ? WHERE playlist_id = ?',
+                    (time.time(), playlist_id)
+                )
+                connection.commit()
+                self.hits[PLAYLISTS_TABLE] += 1
+            else:
+                self.misses[PLAYLISTS_TABLE] += 1
+        return {'snapshot_id': row[0], 'content': json.loads(row[1])} if row else None
+
+    def put_playlist(self, playlist_id: str, snapshot_id: str, content: dict):
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                f'INSERT OR REPLACE INTO {PLAYLISTS_TABLE} (playlist_id, snapshot_id, data, accessed) VALUES (?, ?, ?, ?)',
+                (playlist_id, snapshot_id, json.dumps(content, separators=(',', ':')), time.time())
+            )
+            self._evict(connection, PLAYLISTS_TABLE, self.max_playlists, 1, 'playlist_id')
+            connection.commit()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        result = dict()
+        for table in TABLES + (PLAYLISTS_TABLE,):
+            lookups = self.hits[table] + self.misses[table]
+            result[table] = {
+                'hits': self.hits[table],
+                'misses': self.misses[table],
+                'hit_ratio': self.hits[table] / lookups if lookups else 0.0
+            }
+        return result
+
+    def clear(self):
+        with self._lock:
+            connection = self._connect()
+            for table in TABLES + (PLAYLISTS_TABLE,):
+                connection.execute(f'DELETE FROM {table}')
+                self._counts[table] = 0
+            connection.commit()
+
+    def _evict(self, connection: sqlite3.Connection, table: str, max_entries: int, added: int, key: str = 'track_id'):
+        # the running count over-estimates replaced rows; only count exactly once it passes the limit
+        count = self._counts.get(table)
+        count = self._count(connection, table) if count is None else count + added
+        if count > max_entries:
+            count = self._count(connection, table)
+        if count > max_entries:
+            target = int(max_entries * (1 - EVICT_SLACK))
+            connection.execute(
+                f'DELETE FROM {table} WHERE {key} IN '
+                f'(SELECT {key} FROM {table} ORDER BY accessed LIMIT ?)',
+                (count - target,)
+            )
+            count = target
+        self._counts[table] = count
+
+    @staticmethod
+    def _count(connection: sqlite3.Connection, table: str) -> int:
+        return connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            for table in TABLES:
+                self._connection.execute(
+                    f'CREATE TABLE IF NOT EXISTS {table} '
+                    f'(track_id TEXT PRIMARY KEY, data TEXT NOT NULL, accessed REAL NOT NULL)'
+                )
+                self._connection.execute(f'CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed)')
+            self._connection.execute(
+                f'CREATE TABLE IF NOT EXISTS {PLAYLISTS_TABLE} '
+                f'(playlist_id TEXT PRIMARY KEY, snapshot_id TEXT NOT NULL, data TEXT NOT NULL, accessed REAL NOT NULL)'
+            )
+            self._connection.commit()
+        return self._connection
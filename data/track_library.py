@@ -0,0 +1,188 @@
+import heapq
+import re
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Optional
+
+from data.track_table import STRING_COLUMNS, NUMERIC_COLUMNS, correct_tempo
+
+DEFAULT_LIBRARY_PATH = '.musicalify-library.sqlite'
+
+LIBRARY_TABLE = 'library'
+COLUMNS = STRING_COLUMNS + NUMERIC_COLUMNS
+FEATURE_COLUMNS = tuple(name for name in NUMERIC_COLUMNS if name != 'tempo')
+
+MAX_SQL_PARAMS = 500
+INSORT_LIMIT = 64
+
+QUERY_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)\s*(?:bpm)?((?:[\s,]+\w+\s*(?:>=|<=|>|<)\s*\d*\.?\d+)*)\s*$', re.IGNORECASE)
+CONDITION_PATTERN = re.compile(r'(\w+)\s*(>=|<=|>|<)\s*(\d*\.?\d+)')
+
+Condition = tuple[str, str, float]
+
+
+class TrackLibrary:
+    path: str
+    _connection: Optional[sqlite3.Connection]
+    _lock: threading.Lock
+    _tempo_by_id: dict[str, float]
+    _tempos: list[float]
+    _track_ids: list[str]
+    _pending: dict[str, Optional[float]]
+    _seq: int
+
+    def __init__(self, path: str = DEFAULT_LIBRARY_PATH):
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+        self._tempo_by_id = dict()
+        self._tempos = list()
+        self._track_ids = list()
+        self._pending = dict()
+        self._seq = 0
+
+    def add(self, tracks: list[dict]):
+        if not tracks:
+            return
+        with self._lock:
+            connection = self._connect()
+            self._refresh(connection)
+            changed = {track_data['track_id']: track_data for track_data in tracks if self._tempo_by_id.get(track_data['track_id']) != track_data['tempo']}
+            if not changed:
+                return
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                seq = connection.execute(f'SELECT COALESCE(MAX(seq), 0) + 1 FROM {LIBRARY_TABLE}').fetchone()[0]
+                connection.executemany(
+                    f'INSERT OR REPLACE INTO {LIBRARY_TABLE} ({", ".join(COLUMNS)}, seq) VALUES ({", ".join("?" * len(COLUMNS))}, ?)',
+                    [tuple(track_data[name] for name in COLUMNS) + (seq,) for track_data in changed.values()]
+                )
+                connection.commit()
+            except BaseException:
+                connection.rollback()
+                raise
+            for track_id, track_data in changed.items():
+                self._set_tempo(track_id, track_data['tempo'])
+
+    def query(self, greater: Optional[float], smaller: Optional[float], double_smaller: float, half_greater: float, corrected_bpm_data: Optional[dict[str, float]] = None, conditions: Optional[list[Condition]] = None) -> list[dict]:
+        lower = float('-inf') if greater is None else greater
+        upper = float('inf') if smaller is None else smaller
+        overrides = corrected_bpm_data or dict()
+        with self._lock:
+            connection = self._connect()
+            self._refresh(connection)
+            if self._pending:
+                self._merge()
+
+            tempos = self._tempos
+            spans = (
+                # doubled: tempo < double_smaller
+                (bisect_left(tempos, lower / 2), min(bisect_right(tempos, upper / 2), bisect_left(tempos, double_smaller))),
+                # unchanged: double_smaller <= tempo <= half_greater
+                (max(bisect_left(tempos, lower), bisect_left(tempos, double_smaller)), min(bisect_right(tempos, upper), bisect_right(tempos, half_greater))),
+                # halved: tempo > half_greater
+                (max(bisect_left(tempos, lower * 2), bisect_right(tempos, half_greater), bisect_left(tempos, double_smaller)), bisect_right(tempos, upper * 2))
+            )
+            track_ids = [track_id for start, end in spans for track_id in self._track_ids[start:end] if track_id not in overrides]
+            track_ids.extend(
+                track_id for track_id, tempo in overrides.items()
+                if track_id in self._tempo_by_id and lower <= correct_tempo(double_smaller, half_greater, tempo) <= upper
+            )
+            tracks = self._fetch(connection, track_ids, conditions or list())
+
+        def sort_key(track_data: dict) -> float:
+            return correct_tempo(double_smaller, half_greater, overrides.get(track_data['track_id'], track_data['tempo']))
+
+        return sorted(tracks, key=sort_key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh(self._connect())
+            return len(self._tempo_by_id)
+
+    def clear(self):
+        with self._lock:
+            connection = self._connect()
+            connection.execute(f'DELETE FROM {LIBRARY_TABLE}')
+            connection.commit()
+            self._tempo_by_id.clear()
+            self._tempos = list()
+            self._track_ids = list()
+            self._pending.clear()
+            self._seq = 0
+
+    def _refresh(self, connection: sqlite3.Connection):
+        rows = connection.execute(
+            f'SELECT track_id, tempo, seq FROM {LIBRARY_TABLE} WHERE seq > ?',
+            (self._seq,)
+        ).fetchall()
+        for track_id, tempo, seq in rows:
+            if self._tempo_by_id.get(track_id) != tempo:
+                self._set_tempo(track_id, tempo)
+            self._seq = max(self._seq, seq)
+
+    def _set_tempo(self, track_id: str, tempo: float):
+        # remember the tempo the sorted index still holds for this track, if any
+        self._pending.setdefault(track_id, self._tempo_by_id.get(track_id))
+        self._tempo_by_id[track_id] = tempo
+
+    def _merge(self):
+        stale = {track_id for track_id, tempo in self._pending.items() if tempo is not None}
+        if stale:
+            index = [(tempo, track_id) for tempo, track_id in zip(self._tempos, self._track_ids) if track_id not in stale]
+            self._tempos = [tempo for tempo, _ in index]
+            self._track_ids = [track_id for _, track_id in index]
+        batch = sorted((self._tempo_by_id[track_id], track_id) for track_id in self._pending)
+        if len(batch) <= INSORT_LIMIT:
+            for tempo, track_id in batch:
+                position = bisect_left(self._track_ids, track_id, bisect_left(self._tempos, tempo), bisect_right(self._tempos, tempo))
+                self._tempos.insert(position, tempo)
+                self._track_ids.insert(position, track_id)
+        else:
+            index = list(heapq.merge(zip(self._tempos, self._track_ids), batch))
+            self._tempos = [tempo for tempo, _ in index]
+            self._track_ids = [track_id for _, track_id in index]
+        self._pending.clear()
+
+    @staticmethod
+    def _fetch(connection: sqlite3.Connection, track_ids: list[str], conditions: list[Condition]) -> list[dict]:
+        where = ''.join(f' AND {name} {op} ?' for name, op, _ in conditions)
+        values = [value for _, _, value in conditions]
+        result = list()
+        for idx in range(0, len(track_ids), MAX_SQL_PARAMS):
+            chunk = track_ids[idx:idx + MAX_SQL_PARAMS]
+            rows = connection.execute(
+                f'SELECT {", ".join(COLUMNS)} FROM {LIBRARY_TABLE} WHERE track_id IN ({",".join("?" * len(chunk))}){where}',
+                chunk + values
+            ).fetchall()
+            result.extend(dict(zip(COLUMNS, row)) for row in rows)
+        return result
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                f'CREATE TABLE IF NOT EXISTS {LIBRARY_TABLE} ('
+                + ', '.join(f'{name} TEXT' for name in STRING_COLUMNS if name != 'track_id')
+                + ', track_id TEXT PRIMARY KEY, '
+                + ', '.join(f'{name} REAL NOT NULL' for name in NUMERIC_COLUMNS)
+                + ', seq INTEGER NOT NULL)'
+            )
+            self._connection.execute(f'CREATE INDEX IF NOT EXISTS {LIBRARY_TABLE}_seq ON {LIBRARY_TABLE} (seq)')
+        return self._connection
+
+
+def parse_query(text: str) -> Optional[dict]:
+    match = QUERY_PATTERN.match(text)
+    if not match:
+        return None
+    conditions = list()
+    for name, op, value in CONDITION_PATTERN.findall(match.group(3)):
+        name = name.lower()
+        if name not in FEATURE_COLUMNS:
+            return None
+        conditions.append((name, op, float(value)))
+    greater, smaller = sorted((float(match.group(1)), float(match.group(2))))
+    return {'greater': greater, 'smaller': smaller, 'conditions': conditions}
@@ -0,0 +1,136 @@
+import io
+import json
+from typing import Hashable, Optional
+
+import numpy as np
+
+STRING_COLUMNS = ('title', 'artist', 'img_url', 'track_id')
+NUMERIC_COLUMNS = ('tempo', 'acousticness', 'danceability', 'energy', 'instrumentalness', 'valence')
+
+
+class TrackTable:
+    title: Optional[str]
+    columns: dict[str, np.ndarray]
+    rows_by_track_id: dict[str, list[int]]
+    _override_layer: Optional[tuple[Hashable, np.ndarray]]
+    _correction_layer: Optional[tuple[Hashable, np.ndarray]]
+
+    def __init__(self, title: Optional[str], columns: dict[str, np.ndarray]):
+        self.title = title
+        self.columns = columns
+        for column in columns.values():
+            column.setflags(write=False)
+        self._override_layer = None
+        self._correction_layer = None
+        self.rows_by_track_id = dict()
+        for row, track_id in enumerate(columns['track_id']):
+            self.rows_by_track_id.setdefault(track_id, list()).append(row)
+
+    @staticmethod
+    def from_content(content: dict) -> 'TrackTable':
+        tracks = content['tracks']
+        columns = dict()
+        for name in STRING_COLUMNS:
+            columns[name] = np.array([track[name] for track in tracks], dtype=object)
+        for name in NUMERIC_COLUMNS:
+            columns[name] = np.array([track[name] for track in tracks], dtype=np.float64)
+        return TrackTable(content['title'], columns)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'TrackTable':
+        header_size = int.from_bytes(data[:4], 'big')
+        header = json.loads(data[4:4 + header_size].decode('utf-8'))
+        numeric = np.load(io.BytesIO(data[4 + header_size:]), allow_pickle=False)
+        columns = {name: np.array(header['columns'][name], dtype=object) for name in STRING_COLUMNS}
+        columns.update((name, numeric[name]) for name in NUMERIC_COLUMNS)
+        return TrackTable(header['title'], columns)
+
+    def to_bytes(self) -> bytes:
+        header = json.dumps({
+            'title': self.title,
+            'columns': {name: self.columns[name].tolist() for name in STRING_COLUMNS}
+        }, separators=(',', ':')).encode('utf-8')
+        numeric = io.BytesIO()
+        np.savez(numeric, **{name: self.columns[name] for name in NUMERIC_COLUMNS})
+        return len(header).to_bytes(4, 'big') + header + numeric.getvalue()
+
+    def __len__(self) -> int:
+        return len(self.columns['track_id'])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def to_dict(self) -> dict[str, list]:
+        return {name: column.tolist() for name, column in self.columns.items()}
+
+    def apply_overrides(self, corrected_bpm_data: dict[str, float]) -> np.ndarray:
+        tempo = self.columns['tempo'].copy()
+        if corrected_bpm_data:
+            if len(corrected_bpm_data) < len(self.rows_by_track_id):
+                overrides = [(track_id, value) for track_id, value in corrected_bpm_data.items() if track_id in self.rows_by_track_id]
+            else:
+                overrides = [(track_id, corrected_bpm_data[track_id]) for track_id in self.rows_by_track_id if track_id in corrected_bpm_data]
+            for track_id, value in overrides:
+                tempo[self.rows_by_track_id[track_id]] = value
+        return tempo
+
+    def overridden_tempo(self, version: Hashable, corrected_bpm_data: dict[str, float]) -> np.ndarray:
+        layer = self._override_layer
+        if layer is None or layer[0] != version:
+            tempo = self.apply_overrides(corrected_bpm_data)
+            tempo.setflags(write=False)
+            layer = (version, tempo)
+            self._override_layer = layer
+        return layer[1]
+
+    def corrected_tempo(self, version: Hashable, corrected_bpm_data: dict[str, float], double_smaller: float, half_greater: float) -> np.ndarray:
+        key = (version, double_smaller, half_greater)
+        layer = self._correction_layer
+        if layer is None or layer[0] != key:
+            tempo = correct_tempos(double_smaller, half_greater, self.overridden_tempo(version, corrected_bpm_data))
+            tempo.setflags(write=False)
+            layer = (key, tempo)
+            self._correction_layer = layer
+        return layer[1]
+
+    def track(self, track_id: str) -> Optional[dict]:
+        rows = self.rows_by_track_id.get(track_id)
+        if not rows:
+            return None
+        return self.rows(rows[:1], self.columns['tempo'])[0]
+
+    def rows(self, indices: np.ndarray, tempo: np.ndarray) -> list[dict]:
+        result = list()
+        for idx in indices:
+            track_data = {name: self.columns[name][idx] for name in STRING_COLUMNS}
+            track_data.update((name, float(self.columns[name][idx])) for name in NUMERIC_COLUMNS)
+            track_data['tempo'] = float(tempo[idx])
+            result.append(track_data)
+        return result
+
+
+def correct_tempo(double_smaller: float, half_greater: float, tempo: float) -> float:
+    if tempo < double_smaller:
+        return tempo * 2
+    if tempo > half_greater:
+        return tempo / 2
+    return tempo
+
+
+def correct_tempos(double_smaller: float, half_greater: float, tempo: np.ndarray) -> np.ndarray:
+    return np.where(tempo < double_smaller, tempo * 2, np.where(tempo > half_greater, tempo / 2, tempo))
+
+
+def filter_tempos(filter_settings: dict[str, float], tempo: np.ndarray) -> np.ndarray:
+    mask = np.ones(len(tempo), dtype=bool)
+    if filter_settings:
+        if 'greater' in filter_settings:
+            mask &= ~(tempo < filter_settings['greater'])
+        if 'smaller' in filter_settings:
+            mask &= ~(tempo > filter_settings['smaller'])
+    return mask
+
+
+def sort_indices(indices: np.ndarray, tempo: np.ndarray, descending: bool) -> np.ndarray:
+    keys = -tempo[indices] if descending else tempo[indices]
+    return indices[np.argsort(keys, kind='stable')]
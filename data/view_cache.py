@@ -0,0 +1,48 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+DEFAULT_MAX_ENTRIES = 64
+
+
+class ViewCache:
+    max_entries: int
+    hits: int
+    misses: int
+    _entries: OrderedDict
+    _lock: threading.Lock
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, handle: str, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is not None and entry[0] == key:
+                self._entries.move_to_end(handle)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        view = compute()
+        with self._lock:
+            self._entries[handle] = (key, view)
+            self._entries.move_to_end(handle)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return view
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
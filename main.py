@@ -1,4 +1,4 @@
-from ui.app import App
+from ui.app import App, CLIENTSIDE_VIEW_ENV, VIRTUAL_LIST_ENV, env_flag
 
 if __name__ == '__main__':
-    App(debug=False).run()
+    App(debug=False, clientside_view=env_flag(CLIENTSIDE_VIEW_ENV), virtual_list=env_flag(VIRTUAL_LIST_ENV)).run()
@@ -0,0 +1,30 @@
+import unittest
+from unittest import mock
+
+import data.spotify_content_extraction as content_extr
+from data.request_scheduler import DEFAULT_RATE, DEFAULT_BURST
+from ui.app import App, VIRTUAL_LIST_ENV, env_flag
+
+
+class AppTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = content_extr.scheduler
+
+    def tearDown(self):
+        content_extr.scheduler = self.scheduler
+
+    @mock.patch.dict('os.environ', {'MUSICALIFY_SECRET_KEY': 'test'})
+    def test_workers_split_the_request_rate(self):
+        App(debug=False, workers=4)
+
+        self.assertEqual(content_extr.scheduler.rate, DEFAULT_RATE / 4)
+        self.assertEqual(content_extr.scheduler.burst, DEFAULT_BURST // 4)
+
+    def test_view_modes_are_read_from_the_environment(self):
+        for value, expected in (('1', True), ('true', True), ('0', False), ('', False)):
+            with mock.patch.dict('os.environ', {VIRTUAL_LIST_ENV: value}):
+                self.assertEqual(env_flag(VIRTUAL_LIST_ENV), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import io
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from data.content_store import ContentStore
+from data.track_table import TrackTable
+
+
+def table() -> TrackTable:
+    tracks = [
+        {
+            'title': f'Track {idx}', 'artist': 'Artist', 'img_url': None, 'track_id': f'spotify:track:{idx}',
+            'tempo': 90.5 + idx, 'acousticness': 0.1, 'danceability': 0.2, 'energy': 0.3, 'instrumentalness': 0.4, 'valence': 0.5
+        }
+        for idx in range(5)
+    ]
+    return TrackTable.from_content({'title': 'Playlist', 'tracks': tracks})
+
+
+class SharedContentStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = f'{self.directory.name}/state.sqlite'
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def store(self, ttl: float = 60) -> ContentStore:
+        return ContentStore(ttl=ttl, path=self.path, dumps=TrackTable.to_bytes, loads=TrackTable.from_bytes)
+
+    def test_tables_are_shared_between_stores(self):
+        original = table()
+        handle = self.store().put(original)
+
+        shared = self.store().get(handle)
+
+        self.assertEqual(shared.title, original.title)
+        self.assertEqual(shared.to_dict(), original.to_dict())
+        self.assertFalse(shared['tempo'].flags.writeable)
+        self.assertEqual(shared.rows_by_track_id, original.rows_by_track_id)
+
+    @mock.patch('data.content_store.SHARED_TOUCH_INTERVAL', 0.05)
+    def test_local_hits_keep_shared_tables_alive(self):
+        owner = self.store(ttl=0.3)
+        handle = owner.put(table())
+        other_worker = self.store(ttl=0.3)
+
+        deadline = time.monotonic() + 0.6
+        while time.monotonic() < deadline:
+            self.assertIsNotNone(other_worker.get(handle))
+            time.sleep(0.02)
+
+        self.assertIsNotNone(self.store(ttl=0.3).get(handle))
+        self.assertIsNotNone(owner.get(handle))
+
+    def test_pickled_data_is_not_loaded(self):
+        data = table().to_bytes()
+        header_size = int.from_bytes(data[:4], 'big')
+        numeric = io.BytesIO()
+        np.savez(numeric, tempo=np.array([object()], dtype=object))
+        handle = self.store().put(table())
+        connection = sqlite3.connect(self.path)
+        connection.execute('UPDATE tables SET data = ? WHERE handle = ?', (data[:4 + header_size] + numeric.getvalue(), handle))
+        connection.commit()
+        connection.close()
+
+        with self.assertRaises(ValueError):
+            self.store().get(handle)
+
+    def test_shared_store_needs_serializer(self):
+        with self.assertRaises(ValueError):
+            ContentStore(path=self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+import unittest
+from unittest import mock
+
+from dash import Dash, html
+
+from data.content_store import ContentStore
+from data.track_table import TrackTable
+from data.view_cache import ViewCache
+from ui.callbacks import derive_view, SORT_STATE_DESC
+from ui.export import init_export, pq
+
+FILTER_SETTINGS = {'greater': 90.0, 'smaller': 125.0}
+
+
+def content(size: int) -> dict:
+    tracks = [
+        {
+            'title': f'Track {idx}', 'artist': 'Artist, "quoted"', 'img_url': None, 'track_id': f'spotify:track:{idx}',
+            'tempo': 60.0 + idx * 37 % 140, 'acousticness': 0.1, 'danceability': 0.2, 'energy': 0.3, 'instrumentalness': 0.4, 'valence': 0.5
+        }
+        for idx in range(size)
+    ]
+    return {'title': 'My Playlist', 'tracks': tracks}
+
+
+@mock.patch('ui.export.EXPORT_CHUNK_SIZE', 7)
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        app = Dash(__name__)
+        app.layout = html.Div()
+        self.content_store = ContentStore()
+        init_export(app, self.content_store, ViewCache())
+        self.client = app.server.test_client()
+        self.table = TrackTable.from_content(content(50))
+        self.handle = self.content_store.put(self.table)
+        corrected_bpm_data = {'spotify:track:4': 100.0}
+        tempo, indices = derive_view(self.table, FILTER_SETTINGS, SORT_STATE_DESC, 1, corrected_bpm_data)
+        self.expected = [(self.table['track_id'][idx], float(tempo[idx])) for idx in indices]
+
+    def export(self, export_format: str, handle: str = None):
+        view = {
+            'handle': handle or self.handle,
+            'format': export_format,
+            'filter_settings': FILTER_SETTINGS,
+            'bpm_sort_state': SORT_STATE_DESC,
+            'corrected_bpm_version': 1,
+            'corrected_bpm_data': {'spotify:track:4': 100.0}
+        }
+        return self.client.post('/export', data={'view': json.dumps(view)})
+
+    def test_csv_matches_current_view(self):
+        response = self.export('csv')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('My-Playlist.musicalify.csv', response.headers['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        self.assertGreater(len(rows), 7)
+        self.assertEqual([(row['track_id'], float(row['tempo'])) for row in rows], self.expected)
+        self.assertEqual(rows[0]['artist'], 'Artist, "quoted"')
+
+    def test_ndjson_matches_current_view(self):
+        response = self.export('ndjson')
+
+        self.assertEqual(response.status_code, 200)
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([(row['track_id'], row['tempo']) for row in rows], self.expected)
+
+    @unittest.skipIf(pq is None, 'pyarrow is not installed')
+    def test_parquet_matches_current_view(self):
+        response = self.export('parquet')
+
+        self.assertEqual(response.status_code, 200)
+        rows = pq.read_table(io.BytesIO(response.get_data())).to_pylist()
+        self.assertEqual([(row['track_id'], row['tempo']) for row in rows], self.expected)
+
+    def test_parquet_without_pyarrow_is_not_implemented(self):
+        with mock.patch('ui.export.pq', None):
+            self.assertEqual(self.export('parquet').status_code, 501)
+
+    def test_bad_requests_are_rejected(self):
+        self.assertEqual(self.export('xlsx').status_code, 400)
+        self.assertEqual(self.client.post('/export', data={'view': '{'}).status_code, 400)
+        self.assertEqual(self.export('csv', handle='unknown').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from data.load_jobs import LoadJobs
+
+
+def wait_done(load_jobs: LoadJobs, job_id: str) -> dict:
+    for _ in range(500):
+        status = load_jobs.status(job_id)
+        if status['done']:
+            return status
+        time.sleep(0.01)
+    raise AssertionError('load job did not finish')
+
+
+class LoadJobsTest(unittest.TestCase):
+    def setUp(self):
+        self.load_jobs = LoadJobs()
+        self.published = list()
+        self.release = threading.Event()
+        self.loads = 0
+
+    def publish(self, content: dict) -> str:
+        self.published.append(len(content['tracks']))
+        return f'handle{len(self.published)}'
+
+    def load(self, events: int = 3, size: int = 10):
+        self.loads += 1
+
+        def iterate():
+            for idx in range(events):
+                self.release.wait(5)
+                yield {'title': 'Playlist', 'total': events * size, 'tracks': [{'idx': idx}] * size}
+        return iterate()
+
+    def test_concurrent_loads_of_one_source_share_a_job(self):
+        first = self.load_jobs.start(self.load, self.publish, lambda handle: None, ('playlist', 'abc'))
+        second = self.load_jobs.start(self.load, self.publish, lambda handle: None, ('playlist', 'abc'))
+        other = self.load_jobs.start(self.load, self.publish, lambda handle: None, ('playlist', 'xyz'))
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.release.set()
+        self.assertEqual(wait_done(self.load_jobs, first)['loaded'], 30)
+        self.assertEqual(self.loads, 2)
+
+        third = self.load_jobs.start(self.load, self.publish, lambda handle: None, ('playlist', 'abc'))
+        self.assertNotEqual(first, third)
+
+    def test_job_is_cancelled_only_when_every_waiter_cancels(self):
+        job_id = self.load_jobs.start(self.load, self.publish, lambda handle: None, ('album', 'abc'))
+        self.load_jobs.start(self.load, self.publish, lambda handle: None, ('album', 'abc'))
+        job = self.load_jobs.get(job_id)
+
+        self.load_jobs.cancel(job_id)
+        self.assertFalse(job.cancelled.is_set())
+        self.load_jobs.cancel(job_id)
+        self.assertTrue(job.cancelled.is_set())
+        self.release.set()
+
+    @mock.patch('data.load_jobs.PUBLISH_INTERVAL', 0)
+    def test_published_rows_grow_linearly(self):
+        self.release.set()
+        job_id = self.load_jobs.start(lambda: self.load(events=1000, size=10), self.publish, lambda handle: None)
+
+        self.assertEqual(wait_done(self.load_jobs, job_id)['loaded'], 10000)
+        self.assertEqual(self.published[-1], 10000)
+        self.assertLessEqual(sum(self.published), 3 * 10000)
+
+    def test_running_jobs_are_not_evicted(self):
+        load_jobs = LoadJobs(max_jobs=2)
+        first = load_jobs.start(self.load, self.publish, lambda handle: None)
+        load_jobs.start(self.load, self.publish, lambda handle: None)
+        load_jobs.start(self.load, self.publish, lambda handle: None)
+
+        self.assertEqual(len(load_jobs), 3)
+        self.assertFalse(load_jobs.get(first).cancelled.is_set())
+        self.release.set()
+        wait_done(load_jobs, first)
+
+        load_jobs.start(self.load, self.publish, lambda handle: None)
+        self.assertIsNone(load_jobs.get(first))
+
+    @mock.patch('data.load_jobs.PUBLISH_INTERVAL', 1000)
+    @mock.patch('data.load_jobs.STATUS_INTERVAL', 0)
+    def test_shared_status_and_cancel_do_not_wait_for_publish(self):
+        def load():
+            for idx in range(2000):
+                time.sleep(0.002)
+                yield {'title': 'Playlist', 'total': 20000, 'tracks': [{'idx': idx}] * 10}
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'jobs.sqlite')
+            job_id = LoadJobs(path=path).start(load, self.publish, lambda handle: None)
+            other_worker = LoadJobs(path=path)
+            for _ in range(500):
+                if other_worker.status(job_id)['loaded'] >= 50:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(self.published, [10])
+
+            other_worker.cancel(job_id)
+            status = wait_done(other_worker, job_id)
+            self.assertLess(status['loaded'], 20000)
+
+
+if __name__ == '__main__':
+    unittest.main()
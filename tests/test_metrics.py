@@ -0,0 +1,32 @@
+import unittest
+
+from benchmarks.fake_spotify_api import FakeSpotifyAPI, fake_track_id
+from data.http_session import build_session
+from data.request_scheduler import RequestScheduler
+from ui.metrics import record_spotify_response, spotify_rate_limited, spotify_requests
+
+
+class SpotifyMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeSpotifyAPI().start()
+        session = build_session(status_forcelist=(500, 502, 503, 504))
+        session.hooks['response'].append(record_spotify_response)
+        self.spotify = self.api.client(session)
+
+    def tearDown(self):
+        self.api.stop()
+
+    def test_every_rate_limit_response_is_counted(self):
+        rate_limited = spotify_rate_limited.value(endpoint='/v1/tracks')
+        requests = spotify_requests.value(endpoint='/v1/tracks', method='GET', status='429')
+        self.api.rate_limit(3, retry_after=0.01)
+
+        RequestScheduler(rate=1000.0, burst=1000).call(self.spotify.tracks, [fake_track_id(1)])
+
+        self.assertEqual(self.api.hits, 4)
+        self.assertEqual(spotify_rate_limited.value(endpoint='/v1/tracks') - rate_limited, 3)
+        self.assertEqual(spotify_requests.value(endpoint='/v1/tracks', method='GET', status='429') - requests, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import time
+import unittest
+
+from benchmarks.fake_spotify_api import FakeSpotifyAPI, fake_track_id
+from data.http_session import build_session
+from data.request_scheduler import RequestScheduler
+
+
+class RateLimitTest(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeSpotifyAPI().start()
+        self.spotify = self.api.client(build_session(status_forcelist=(429, 500, 502, 503, 504)))
+        self.scheduler = RequestScheduler(rate=1000.0, burst=1000)
+        self.pauses = list()
+        pause = self.scheduler._pause
+
+        def record_pause(seconds: float):
+            self.pauses.append(seconds)
+            pause(seconds)
+
+        self.scheduler._pause = record_pause
+
+    def tearDown(self):
+        self.api.stop()
+
+    def test_rate_limit_reaches_scheduler(self):
+        self.api.rate_limit(1, retry_after=0.2)
+        start = time.monotonic()
+        result = self.scheduler.call(self.spotify.tracks, [fake_track_id(1)])
+
+        self.assertEqual(result['tracks'][0]['id'], fake_track_id(1))
+        self.assertEqual(self.api.hits, 2)
+        self.assertEqual(self.pauses, [0.2])
+        self.assertEqual(self.scheduler.throttled, 1)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from data.single_flight import SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def slow(self, result):
+        def call():
+            self.calls += 1
+            self.release.wait(5)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return call
+
+    def run_concurrently(self, key, fn, count: int = 4) -> list:
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(self.single_flight.do, key, fn) for _ in range(count)]
+            time.sleep(0.1)
+            self.release.set()
+        return futures
+
+    def test_concurrent_calls_share_one_result(self):
+        futures = self.run_concurrently('key', self.slow(['result']))
+
+        results = [future.result() for future in futures]
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [['result']] * 4)
+        self.assertIs(results[0], results[1])
+
+    def test_exception_reaches_every_waiter(self):
+        futures = self.run_concurrently('key', self.slow(ValueError('failed')))
+
+        for future in futures:
+            with self.assertRaisesRegex(ValueError, 'failed'):
+                future.result()
+        self.assertEqual(self.calls, 1)
+
+    def test_key_is_removed_after_completion(self):
+        self.release.set()
+        self.assertEqual(self.single_flight.do('key', self.slow(1)), 1)
+        self.assertEqual(len(self.single_flight), 0)
+        with self.assertRaises(ValueError):
+            self.single_flight.do('key', self.slow(ValueError()))
+        self.assertEqual(len(self.single_flight), 0)
+
+        self.assertEqual(self.single_flight.do('key', self.slow(2)), 2)
+        self.assertEqual(self.calls, 3)
+
+    def test_different_keys_do_not_share(self):
+        self.release.set()
+        self.assertEqual(self.single_flight.do('first', self.slow(1)), 1)
+        self.assertEqual(self.single_flight.do('second', self.slow(2)), 2)
+        self.assertEqual(self.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
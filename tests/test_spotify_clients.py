@@ -0,0 +1,36 @@
+import gc
+import tempfile
+import unittest
+from unittest import mock
+
+from data.http_session import build_session
+from data.spotify_clients import SpotifyClients
+from data.token_store import SQLiteTokenStore
+
+
+class SpotifyClientsTest(unittest.TestCase):
+    @mock.patch.dict('os.environ', {'SPOTIPY_CLIENT_ID': 'client', 'SPOTIPY_REDIRECT_URI': 'http://127.0.0.1:8050/'})
+    def test_evicted_clients_keep_shared_session_open(self):
+        session = build_session()
+        adapter = session.get_adapter('https://api.spotify.com/')
+        adapter.poolmanager.connection_from_url('https://api.spotify.com/')
+
+        with tempfile.TemporaryDirectory() as directory:
+            clients = SpotifyClients(
+                token_store=SQLiteTokenStore(f'{directory}/tokens.sqlite'),
+                session=session,
+                scope='user-modify-playback-state',
+                requests_timeout=(1.0, 1.0),
+                status_forcelist=(),
+                max_clients=1
+            )
+            clients.get('a' * 32)
+            clients.get('b' * 32)
+            gc.collect()
+
+            self.assertEqual(len(clients._clients), 1)
+            self.assertEqual(len(adapter.poolmanager.pools), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
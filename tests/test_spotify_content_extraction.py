@@ -0,0 +1,83 @@
+import tempfile
+import unittest
+
+import data.spotify_content_extraction as content_extr
+import data.spotify_uri_utils as uri_utils
+from benchmarks.fake_spotify_api import FakeSpotifyAPI, fake_track_id
+from data.request_scheduler import RequestScheduler
+from data.single_flight import SingleFlight
+from data.track_cache import TrackCache, FEATURES_TABLE
+
+
+class ExtractionTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.api = FakeSpotifyAPI().start()
+        self.spotify = self.api.client()
+        self.globals = (content_extr.track_cache, content_extr.track_library, content_extr.scheduler, content_extr.single_flight)
+        content_extr.track_cache = TrackCache(f'{self.directory.name}/cache.sqlite')
+        content_extr.track_library = None
+        content_extr.scheduler = RequestScheduler(rate=1000.0, burst=1000)
+        content_extr.single_flight = SingleFlight()
+
+    def tearDown(self):
+        content_extr.track_cache, content_extr.track_library, content_extr.scheduler, content_extr.single_flight = self.globals
+        self.api.stop()
+        self.directory.cleanup()
+
+    def test_parallel_paging_matches_serial_paging(self):
+        for size in (1, 99, 100, 101, 257):
+            serial = content_extr.get_playlist_tracks(self.spotify, f'size{size}', parallel=False)
+            self.assertEqual(content_extr.get_playlist_tracks(self.spotify, f'size{size}'), serial)
+            self.assertEqual([track['id'] for track in serial], [fake_track_id(idx) for idx in range(size)])
+        for size in (1, 49, 50, 51, 123):
+            serial = content_extr.get_album_tracks(self.spotify, f'size{size}', parallel=False)
+            self.assertEqual(content_extr.get_album_tracks(self.spotify, f'size{size}'), serial)
+            self.assertEqual([track['id'] for track in serial], [fake_track_id(idx) for idx in range(size)])
+
+    def test_removed_tracks_are_skipped_on_every_page(self):
+        playlist_tracks = content_extr.get_playlist_tracks(self.spotify, 'size3')
+        pages = iter([(5, [None, playlist_tracks[0]]), (5, [playlist_tracks[1], None, playlist_tracks[2]])])
+
+        enriched = list(content_extr.iter_enriched_pages(self.spotify, pages, dict()))
+
+        self.assertEqual([[track_data['track_id'] for track_data in tracks] for _, tracks in enriched], [
+            [playlist_tracks[0]['uri']],
+            [playlist_tracks[1]['uri'], playlist_tracks[2]['uri']]
+        ])
+
+    def test_track_features_of_loaded_track_are_cached(self):
+        track_data = content_extr.get_content_track(self.spotify, fake_track_id(7))['tracks'][0]
+        self.api.reset_calls()
+
+        features = content_extr.get_track_features(self.spotify, uri_utils.parse_track_id(track_data['track_id']))
+
+        self.assertEqual(features['tempo'], track_data['tempo'])
+        self.assertNotIn('audio_features', self.api.calls)
+        self.assertEqual(content_extr.track_cache.get_many(FEATURES_TABLE, [track_data['track_id']]), {})
+
+    def test_batch_reports_failed_sources_and_loads_the_rest(self):
+        sources = [('playlist', 'size150'), ('playlist', 'missing'), ('album', 'size20')]
+        events = list(content_extr.iter_content_batch(self.spotify, sources))
+
+        tracks = [track_data for event in events for track_data in event['tracks']]
+        errors = [error for event in events for error in event.get('errors', ())]
+        self.assertEqual(len(tracks), 150)
+        self.assertEqual(len(errors), 1)
+        self.assertIn('https://open.spotify.com/playlist/missing', errors[0])
+
+    def test_batch_reuses_stored_playlist_snapshots(self):
+        sources = [('playlist', 'size150'), ('album', 'size200')]
+        first = [track_data for event in content_extr.iter_content_batch(self.spotify, sources) for track_data in event['tracks']]
+        self.api.reset_calls()
+
+        second = [track_data for event in content_extr.iter_content_batch(self.spotify, sources) for track_data in event['tracks']]
+
+        self.assertEqual(second, first)
+        self.assertNotIn('playlist_items', self.api.calls)
+        self.assertNotIn('audio_features', self.api.calls)
+        self.assertEqual(content_extr.load_content_playlist(self.spotify, 'size150')['tracks'], first[:150])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import tempfile
+import unittest
+
+from data.track_cache import TrackCache, FEATURES_TABLE
+
+
+class TrackCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = TrackCache(f'{self.directory.name}/cache.sqlite', max_entries=100)
+        self.counts = 0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def trace(self, statement: str):
+        if 'COUNT(*)' in statement:
+            self.counts += 1
+
+    def test_puts_do_not_count_rows_every_time(self):
+        self.cache.put_many(FEATURES_TABLE, {'first': {'tempo': 1.0}})
+        self.cache._connect().set_trace_callback(self.trace)
+
+        for idx in range(20):
+            self.cache.put_many(FEATURES_TABLE, {f'track{idx}': {'tempo': float(idx)}})
+
+        self.assertEqual(self.counts, 0)
+
+    def test_least_recently_used_rows_are_evicted(self):
+        self.cache.put_many(FEATURES_TABLE, {'kept': {'tempo': 1.0}})
+        for idx in range(30):
+            self.cache.put_many(FEATURES_TABLE, {f'track{idx}_{sub}': {'tempo': 2.0} for sub in range(5)})
+            self.cache.get_many(FEATURES_TABLE, ['kept'])
+
+        rows = self.cache._connect().execute(f'SELECT COUNT(*) FROM {FEATURES_TABLE}').fetchone()[0]
+        self.assertLessEqual(rows, 100)
+        self.assertIn('kept', self.cache.get_many(FEATURES_TABLE, ['kept']))
+        self.assertNotIn('track0_0', self.cache.get_many(FEATURES_TABLE, ['track0_0']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import random
+import tempfile
+import unittest
+
+from data.track_library import TrackLibrary
+from data.track_table import correct_tempo
+
+
+def track(idx: int, tempo: float) -> dict:
+    return {
+        'title': f'Track {idx}', 'artist': 'Artist', 'img_url': None, 'track_id': f'spotify:track:{idx}',
+        'tempo': tempo, 'acousticness': 0.1, 'danceability': 0.2, 'energy': 0.3, 'instrumentalness': 0.4, 'valence': 0.5
+    }
+
+
+class TrackLibraryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = f'{self.directory.name}/library.sqlite'
+        self.random = random.Random(7)
+        self.tempos = dict()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def random_tempo(self) -> float:
+        # boundary values of the queries below show up often
+        return self.random.choice([
+            self.random.choice([40.0, 60.0, 61.0, 70.0, 90.0, 120.0, 122.0, 126.0, 140.0, 180.0, 244.0, 252.0]),
+            round(self.random.uniform(30.0, 260.0), 1)
+        ])
+
+    def add(self, library: TrackLibrary, count: int):
+        tracks = list()
+        for _ in range(count):
+            idx = self.random.randrange(400)
+            self.tempos[f'spotify:track:{idx}'] = tempo = self.random_tempo()
+            tracks.append(track(idx, tempo))
+        library.add(tracks)
+
+    def brute_force(self, greater, smaller, double_smaller, half_greater, overrides) -> list[float]:
+        lower = float('-inf') if greater is None else greater
+        upper = float('inf') if smaller is None else smaller
+        corrected = [correct_tempo(double_smaller, half_greater, overrides.get(track_id, tempo)) for track_id, tempo in self.tempos.items()]
+        return sorted(tempo for tempo in corrected if lower <= tempo <= upper)
+
+    def assert_queries_match(self, library: TrackLibrary):
+        for greater, smaller in ((122.0, 126.0), (60.0, 61.0), (None, 90.0), (120.0, None), (None, None), (126.0, 122.0)):
+            for double_smaller, half_greater in ((70.0, 180.0), (61.0, 122.0), (90.0, 90.0), (0.0, 1000.0)):
+                overrides = {track_id: self.random_tempo() for track_id in self.random.sample(sorted(self.tempos), 5)}
+                result = library.query(greater, smaller, double_smaller, half_greater, overrides)
+                corrected = [correct_tempo(double_smaller, half_greater, overrides.get(data['track_id'], data['tempo'])) for data in result]
+                self.assertEqual(corrected, self.brute_force(greater, smaller, double_smaller, half_greater, overrides))
+                self.assertEqual(len({data['track_id'] for data in result}), len(result))
+
+    def test_query_matches_brute_force_filter(self):
+        library = TrackLibrary(self.path)
+        self.add(library, 300)
+
+        self.assert_queries_match(library)
+
+    def test_index_stays_correct_across_incremental_adds(self):
+        library = TrackLibrary(self.path)
+        for count in (200, 3, 1, 100, 10):
+            self.add(library, count)
+            self.assert_queries_match(library)
+
+        other_worker = TrackLibrary(self.path)
+        self.assert_queries_match(other_worker)
+        self.add(library, 20)
+        self.assert_queries_match(other_worker)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import itertools
+import random
+import unittest
+
+import data.spotify_content_extraction as content_extr
+from data.track_table import TrackTable, correct_tempo
+from ui.callbacks import derive_view, DEFAULT_DOUBLE_SMALLER, DEFAULT_HALF_GREATER, SORT_STATE_NONE, SORT_STATE_ASC, SORT_STATE_DESC
+
+# thresholds, range limits, exact doubles/halves of them and .5 values that round half to even
+TEMPOS = (49.5, 50.0, 50.5, 60.0, 62.5, 65.0, 65.0, 100.0, 120.0, 120.0, 121.5, 122.5, 130.0, 130.5, 240.0, 244.0, 260.0)
+FILTER_SETTINGS = (
+    None,
+    {},
+    {'greater': 120.0},
+    {'smaller': 130.0},
+    {'greater': 100.0, 'smaller': 122.5},
+    {'greater': 120.0, 'smaller': 130.0, 'double': 65.0, 'half': 121.5},
+    {'double': 62.5, 'half': 244.0}
+)
+OVERRIDES = (dict(), {'spotify:track:3': 99.5, 'spotify:track:11': 65.0, 'spotify:track:unknown': 1.0})
+
+
+def content(tempos: list[float]) -> dict:
+    tracks = [
+        {
+            'title': f'Track {idx}', 'artist': 'Artist', 'img_url': None, 'track_id': f'spotify:track:{idx % 12}',
+            'tempo': tempo, 'acousticness': 0.1, 'danceability': 0.2, 'energy': 0.3, 'instrumentalness': 0.4, 'valence': 0.5
+        }
+        for idx, tempo in enumerate(tempos)
+    ]
+    return {'title': 'Playlist', 'tracks': tracks}
+
+
+def scalar_view(tracks: list[dict], filter_settings: dict, bpm_sort_state: str, corrected_bpm_data: dict) -> list[dict]:
+    double_smaller = filter_settings.get('double', DEFAULT_DOUBLE_SMALLER) if filter_settings else DEFAULT_DOUBLE_SMALLER
+    half_greater = filter_settings.get('half', DEFAULT_HALF_GREATER) if filter_settings else DEFAULT_HALF_GREATER
+    result = list()
+    for track_data in tracks:
+        track_data = dict(track_data)
+        if track_data['track_id'] in corrected_bpm_data:
+            track_data['tempo'] = corrected_bpm_data[track_data['track_id']]
+        track_data['tempo'] = correct_tempo(double_smaller, half_greater, track_data['tempo'])
+        if content_extr.filter_tempo(filter_settings, track_data['tempo']):
+            result.append(track_data)
+    if bpm_sort_state == SORT_STATE_ASC:
+        result.sort(key=lambda d: d['tempo'])
+    if bpm_sort_state == SORT_STATE_DESC:
+        result.sort(key=lambda d: d['tempo'], reverse=True)
+    return result
+
+
+class TrackTableTest(unittest.TestCase):
+    def assert_views_match(self, tempos: list[float]):
+        tracks = content(tempos)
+        for filter_settings, bpm_sort_state, overrides in itertools.product(FILTER_SETTINGS, (SORT_STATE_NONE, SORT_STATE_ASC, SORT_STATE_DESC), OVERRIDES):
+            with self.subTest(filter_settings=filter_settings, bpm_sort_state=bpm_sort_state, overrides=overrides):
+                table = TrackTable.from_content(tracks)
+                tempo, indices = derive_view(table, filter_settings, bpm_sort_state, len(overrides), overrides)
+                rows = table.rows(indices, tempo)
+                expected = scalar_view(tracks['tracks'], filter_settings, bpm_sort_state, overrides)
+
+                self.assertEqual([row['title'] for row in rows], [row['title'] for row in expected])
+                self.assertEqual([row['tempo'] for row in rows], [row['tempo'] for row in expected])
+                self.assertEqual([round(row['tempo']) for row in rows], [round(row['tempo']) for row in expected])
+
+    def test_vectorized_view_matches_scalar_path_on_boundaries(self):
+        self.assert_views_match(list(TEMPOS))
+
+    def test_vectorized_view_matches_scalar_path_on_random_tempos(self):
+        generator = random.Random(3)
+        self.assert_views_match([generator.choice(TEMPOS + (round(generator.uniform(30.0, 270.0), 1),)) for _ in range(60)])
+
+    def test_tempo_layers_are_reused_per_version(self):
+        table = TrackTable.from_content(content(list(TEMPOS)))
+        overrides = {'spotify:track:3': 99.5}
+
+        overridden = table.overridden_tempo(1, overrides)
+        corrected = table.corrected_tempo(1, overrides, 60.0, 130.0)
+        self.assertIs(table.corrected_tempo(1, overrides, 60.0, 130.0), corrected)
+        self.assertIs(table.overridden_tempo(1, overrides), overridden)
+
+        self.assertIsNot(table.corrected_tempo(1, overrides, 65.0, 130.0), corrected)
+        self.assertIs(table.overridden_tempo(1, overrides), overridden)
+
+        changed = table.corrected_tempo(2, {'spotify:track:3': 200.0}, 65.0, 130.0)
+        self.assertIsNot(table.overridden_tempo(2, {'spotify:track:3': 200.0}), overridden)
+        self.assertEqual(changed[3], 100.0)
+        self.assertFalse(changed.flags.writeable)
+
+
+if __name__ == '__main__':
+    unittest.main()
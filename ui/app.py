@@ -1,22 +1,42 @@
+import os
+from typing import Optional
+
 import dash_bootstrap_components as dbc
-import spotipy
+import requests
 from dash import Dash, html
 from dash_extensions.enrich import DashProxy
-from spotipy import Spotify, SpotifyPKCE
 
+import data.spotify_content_extraction as content_extr
+from data.content_store import ContentStore
+from data.http_session import build_session
+from data.load_jobs import LoadJobs
+from data.request_scheduler import RequestScheduler, DEFAULT_RATE, DEFAULT_BURST
+from data.spotify_clients import SpotifyClients, SPOTIFY_CONNECT_TIMEOUT, SPOTIFY_POOL_SIZE, SPOTIFY_READ_TIMEOUT, SPOTIFY_RETRY_STATUSES, SPOTIFY_SCOPE
+from data.token_store import SQLiteTokenStore, TokenStore
+from data.track_table import TrackTable
+from data.view_cache import ViewCache
+from ui import session
 from ui.callbacks import callbacks
+from ui.export import init_export
+from ui.metrics import init_metrics
 from ui.layout.layout import Layout
 
 APP_NAME = 'Musicalify'
+SHARED_STATE_PATH = '.musicalify-state.sqlite'
+CLIENTSIDE_VIEW_ENV = 'MUSICALIFY_CLIENTSIDE_VIEW'
+VIRTUAL_LIST_ENV = 'MUSICALIFY_VIRTUAL_LIST'
 
 
 class App:
     debug: bool
     app: Dash
-    auth_manager: SpotifyPKCE
-    spotify: Spotify
+    session: requests.Session
+    clients: SpotifyClients
+    content_store: ContentStore
+    view_cache: ViewCache
+    load_jobs: LoadJobs
 
-    def __init__(self, debug: bool):
+    def __init__(self, debug: bool, compact_tiles: bool = True, clientside_view: bool = False, virtual_list: bool = False, shared_state: bool = False, token_store: Optional[TokenStore] = None, workers: int = 1):
         self.debug = debug
         self.app = DashProxy(
             __name__,
@@ -24,13 +44,35 @@ class App:
         )
         self.app.title = APP_NAME
         self.app.layout = html.Div([Layout()])
+        session.init_session(self.app.server)
 
-        self.auth_manager = SpotifyPKCE(
-            scope='user-modify-playback-state,playlist-read-private'
+        self.session = build_session(
+            pool_size=SPOTIFY_POOL_SIZE,
+            status_forcelist=SPOTIFY_RETRY_STATUSES
+        )
+        self.clients = SpotifyClients(
+            token_store=token_store if token_store is not None else SQLiteTokenStore(),
+            session=self.session,
+            scope=SPOTIFY_SCOPE,
+            requests_timeout=(SPOTIFY_CONNECT_TIMEOUT, SPOTIFY_READ_TIMEOUT),
+            status_forcelist=SPOTIFY_RETRY_STATUSES
         )
-        self.spotify = spotipy.Spotify(auth_manager=self.auth_manager)
 
-        callbacks(self.app, self.spotify, self.auth_manager)
+        if workers > 1:
+            content_extr.scheduler = RequestScheduler(rate=DEFAULT_RATE / workers, burst=max(DEFAULT_BURST // workers, 1))
+
+        shared_state_path = SHARED_STATE_PATH if shared_state else None
+        self.content_store = ContentStore(path=shared_state_path, dumps=TrackTable.to_bytes, loads=TrackTable.from_bytes)
+        self.view_cache = ViewCache()
+        self.load_jobs = LoadJobs(path=shared_state_path)
+
+        callbacks(self.app, self.clients, self.content_store, self.view_cache, self.load_jobs, compact_tiles, clientside_view, virtual_list)
+        init_metrics(self.app, self.session, self.content_store, self.view_cache)
+        init_export(self.app, self.content_store, self.view_cache)
 
     def run(self):
         self.app.run_server(debug=self.debug)
+
+
+def env_flag(name: str) -> bool:
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
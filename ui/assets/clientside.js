@@ -0,0 +1,399 @@
+const STATS_FEATURES = ["acousticness", "danceability", "energy", "instrumentalness", "valence"];
+const SORT_STATES = ["none", "ascending", "descending"];
+const SORT_ICONS = ["bi bi-arrow-down-up me-1", "bi bi-arrow-down me-1", "bi bi-arrow-up me-1"];
+
+let statsPanelHideID = null;
+
+function show_stats_panel(trigger) {
+    let panel = document.querySelector("#stats-panel");
+    if(panel == null) {
+        return;
+    }
+    clearTimeout(statsPanelHideID);
+
+    let stats = trigger.dataset.stats.split(",");
+    STATS_FEATURES.forEach((feature, idx) => {
+        document.querySelector("#stats-panel-" + feature).textContent = stats[idx] + "%";
+    });
+    panel.dataset.trackId = trigger.dataset.trackId;
+
+    panel.classList.remove("d-none");
+    let rect = trigger.getBoundingClientRect();
+    panel.style.top = Math.max(0, rect.top + rect.height / 2 - panel.offsetHeight / 2) + "px";
+    panel.style.left = Math.max(0, rect.left - panel.offsetWidth - 8) + "px";
+}
+
+function hide_stats_panel() {
+    clearTimeout(statsPanelHideID);
+    statsPanelHideID = setTimeout(() => {
+        let panel = document.querySelector("#stats-panel");
+        if(panel != null) {
+            panel.classList.add("d-none");
+        }
+    }, 200);
+}
+
+document.addEventListener("mouseover", (event) => {
+    let trigger = event.target.closest(".stats-trigger");
+    if(trigger != null) {
+        show_stats_panel(trigger);
+    } else if(event.target.closest("#stats-panel") != null) {
+        clearTimeout(statsPanelHideID);
+    }
+});
+
+document.addEventListener("mouseout", (event) => {
+    if(event.target.closest(".stats-trigger, #stats-panel") != null) {
+        hide_stats_panel();
+    }
+});
+
+function round_half_even(value) {
+    let rounded = Math.round(value);
+    if(Math.abs(value % 1) === 0.5 && rounded % 2 !== 0) {
+        rounded -= 1;
+    }
+    return rounded;
+}
+
+function correct_tempo(double_smaller, half_greater, tempo) {
+    if(tempo < double_smaller) {
+        return tempo * 2;
+    }
+    if(tempo > half_greater) {
+        return tempo / 2;
+    }
+    return tempo;
+}
+
+function filter_tempo(filter_settings, tempo) {
+    if(filter_settings) {
+        if("greater" in filter_settings && tempo < filter_settings.greater) {
+            return false;
+        }
+        if("smaller" in filter_settings && tempo > filter_settings.smaller) {
+            return false;
+        }
+    }
+    return true;
+}
+
+function derive_view(table, filter_settings, bpm_sort_state, corrected_bpm_data) {
+    let columns = table.columns;
+
+    let double_smaller = table.settings.double_smaller;
+    let half_greater = table.settings.half_greater;
+    if(filter_settings) {
+        if("double" in filter_settings) {
+            double_smaller = filter_settings.double;
+        }
+        if("half" in filter_settings) {
+            half_greater = filter_settings.half;
+        }
+    }
+    corrected_bpm_data = corrected_bpm_data || {};
+
+    let tempo = columns.tempo.map((value, idx) => {
+        let track_id = columns.track_id[idx];
+        let raw = track_id in corrected_bpm_data ? corrected_bpm_data[track_id] : value;
+        return correct_tempo(double_smaller, half_greater, raw);
+    });
+
+    let indices = [];
+    tempo.forEach((value, idx) => {
+        if(filter_tempo(filter_settings, value)) {
+            indices.push(idx);
+        }
+    });
+
+    if(bpm_sort_state === SORT_STATES[1]) {
+        indices.sort((a, b) => tempo[a] - tempo[b]);
+    }
+    if(bpm_sort_state === SORT_STATES[2]) {
+        indices.sort((a, b) => tempo[b] - tempo[a]);
+    }
+
+    return {tempo: tempo, indices: indices};
+}
+
+function html_component(type, props) {
+    return {type: type, namespace: "dash_html_components", props: props};
+}
+
+function compact_track_tile(columns, idx, tempo, queued) {
+    let track_id = columns.track_id[idx];
+    let stats = STATS_FEATURES.map((feature) => round_half_even(columns[feature][idx] * 100));
+    return {
+        type: "ListGroupItem",
+        namespace: "dash_bootstrap_components",
+        props: {
+            className: "d-flex justify-content-between align-items-center",
+            children: [
+                html_component("Div", {
+                    className: "d-flex flex-row",
+                    children: [
+                        html_component("Img", {src: columns.img_url[idx], width: 50, height: 50}),
+                        html_component("Div", {
+                            className: "d-flex flex-column ms-3",
+                            children: [
+                                html_component("A", {
+                                    children: columns.title[idx],
+                                    className: "title fw-bold text-body text-decoration-none",
+                                    href: track_id,
+                                    target: "_blank"
+                                }),
+                                html_component("Div", {children: columns.artist[idx], className: "text-muted"})
+                            ]
+                        })
+                    ]
+                }),
+                html_component("Div", {
+                    className: "d-flex flex-row flex-shrink-0",
+                    children: [
+                        html_component("Div", {children: round_half_even(tempo) + " bpm"}),
+                        html_component("I", {
+                            className: "bi bi-three-dots-vertical ms-1 px-1 stats-trigger",
+                            "data-track-id": track_id,
+                            "data-stats": stats.join(",")
+                        }),
+                        html_component("A", {
+                            children: html_component("I", {className: "bi bi-view-stacked"}),
+                            title: "Add to queue",
+                            className: "ms-4 p-1 track-action",
+                            "data-action": "to-queue",
+                            "data-track-id": track_id
+                        }),
+                        html_component("I", {
+                            className: "bi bi-check queue-done" + (queued ? "" : " d-none"),
+                            "data-track-id": track_id
+                        })
+                    ]
+                })
+            ]
+        }
+    };
+}
+
+const VIRTUAL_ROW_HEIGHT = 66;
+const VIRTUAL_BUFFER_ROWS = 10;
+
+let virtualList = {table: null, tempo: [], indices: [], rows: new Map(), frameID: null};
+let queuedTracks = new Set();
+
+function create_element(tag, className, text) {
+    let element = document.createElement(tag);
+    if(className) {
+        element.className = className;
+    }
+    if(text != null) {
+        element.textContent = text;
+    }
+    return element;
+}
+
+function build_virtual_row(position) {
+    let columns = virtualList.table.columns;
+    let idx = virtualList.indices[position];
+    let track_id = columns.track_id[idx];
+
+    let row = create_element("div", "list-group-item d-flex justify-content-between align-items-center virtual-row");
+    row.style.top = (position * VIRTUAL_ROW_HEIGHT) + "px";
+
+    let image = create_element("img");
+    image.src = columns.img_url[idx];
+    image.width = 50;
+    image.height = 50;
+    let title = create_element("a", "title fw-bold text-body text-decoration-none", columns.title[idx]);
+    title.href = track_id;
+    title.target = "_blank";
+    let text = create_element("div", "d-flex flex-column ms-3 text-truncate");
+    text.append(title, create_element("div", "text-muted text-truncate", columns.artist[idx]));
+    let info = create_element("div", "d-flex flex-row text-truncate");
+    info.append(image, text);
+
+    let stats = create_element("i", "bi bi-three-dots-vertical ms-1 px-1 stats-trigger");
+    stats.dataset.trackId = track_id;
+    stats.dataset.stats = STATS_FEATURES.map((feature) => round_half_even(columns[feature][idx] * 100)).join(",");
+    let queue = create_element("a", "ms-4 p-1 track-action");
+    queue.title = "Add to queue";
+    queue.dataset.action = "to-queue";
+    queue.dataset.trackId = track_id;
+    queue.append(create_element("i", "bi bi-view-stacked"));
+    let done = create_element("i", "bi bi-check queue-done" + (queuedTracks.has(track_id) ? "" : " d-none"));
+    done.dataset.trackId = track_id;
+    let actions = create_element("div", "d-flex flex-row flex-shrink-0");
+    actions.append(create_element("div", null, round_half_even(virtualList.tempo[idx]) + " bpm"), stats, queue, done);
+
+    row.append(info, actions);
+    return row;
+}
+
+function update_virtual_rows() {
+    virtualList.frameID = null;
+    let container = document.querySelector("#virtual-tracks");
+    if(container == null || virtualList.table == null) {
+        return;
+    }
+
+    let top = container.getBoundingClientRect().top;
+    let first = Math.max(0, Math.floor(-top / VIRTUAL_ROW_HEIGHT) - VIRTUAL_BUFFER_ROWS);
+    let last = Math.min(virtualList.indices.length, Math.ceil((window.innerHeight - top) / VIRTUAL_ROW_HEIGHT) + VIRTUAL_BUFFER_ROWS);
+
+    virtualList.rows.forEach((row, position) => {
+        if(position < first || position >= last) {
+            row.remove();
+            virtualList.rows.delete(position);
+        }
+    });
+    for(let position = first; position < last; position++) {
+        if(!virtualList.rows.has(position)) {
+            let row = build_virtual_row(position);
+            container.appendChild(row);
+            virtualList.rows.set(position, row);
+        }
+    }
+}
+
+function schedule_virtual_rows() {
+    if(virtualList.frameID == null) {
+        virtualList.frameID = requestAnimationFrame(update_virtual_rows);
+    }
+}
+
+function reset_virtual_rows() {
+    let container = document.querySelector("#virtual-tracks");
+    if(container == null) {
+        return;
+    }
+    virtualList.rows.forEach((row) => row.remove());
+    virtualList.rows.clear();
+    container.style.height = (virtualList.indices.length * VIRTUAL_ROW_HEIGHT) + "px";
+    schedule_virtual_rows();
+}
+
+window.addEventListener("scroll", schedule_virtual_rows, {passive: true});
+window.addEventListener("resize", schedule_virtual_rows);
+
+document.addEventListener("click", (event) => {
+    let action = event.target.closest(".track-action");
+    let trigger = document.querySelector("#track-action-trigger");
+    if(action == null || trigger == null) {
+        return;
+    }
+    trigger.dataset.action = action.dataset.action;
+    trigger.dataset.trackId = action.dataset.trackId;
+    trigger.click();
+});
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    musicalify: {
+        request_edit_bpm: function(n_clicks) {
+            let panel = document.querySelector("#stats-panel");
+            panel.classList.add("d-none");
+            return {track_id: panel.dataset.trackId, n_clicks: n_clicks};
+        },
+
+        append_queue_done: function(queued_track, to_queue_done_data) {
+            to_queue_done_data = to_queue_done_data || [];
+            if(!queued_track || to_queue_done_data.includes(queued_track.track_id)) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            return to_queue_done_data.concat([queued_track.track_id]);
+        },
+
+        dispatch_track_action: function(n_clicks) {
+            let trigger = document.querySelector("#track-action-trigger");
+            return {action: trigger.dataset.action, track_id: trigger.dataset.trackId, n_clicks: n_clicks};
+        },
+
+        mark_queue_done: function(to_queue_done_data) {
+            let queued = new Set(to_queue_done_data || []);
+            let changed = [...queued].filter((track_id) => !queuedTracks.has(track_id))
+                .concat([...queuedTracks].filter((track_id) => !queued.has(track_id)));
+            queuedTracks = queued;
+            changed.forEach((track_id) => {
+                document.querySelectorAll('.queue-done[data-track-id="' + CSS.escape(track_id) + '"]').forEach((icon) => {
+                    icon.classList.toggle("d-none", !queued.has(track_id));
+                });
+            });
+            return window.dash_clientside.no_update;
+        },
+
+        render_tracks: function(table, filter_settings, bpm_sort_state, corrected_bpm_data, active_page, to_queue_done_data) {
+            if(!table) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            let settings = table.settings;
+            let columns = table.columns;
+            let view = derive_view(table, filter_settings, bpm_sort_state, corrected_bpm_data);
+            let tempo = view.tempo;
+            let indices = view.indices;
+
+            if(active_page == null) {
+                active_page = 1;
+            }
+            let num_of_pages = Math.floor(indices.length / settings.tracks_per_page) + 1;
+            if(num_of_pages > 1) {
+                indices = indices.slice((active_page - 1) * settings.tracks_per_page, active_page * settings.tracks_per_page);
+            }
+
+            queuedTracks = new Set(to_queue_done_data || []);
+            let tracks = indices.map((idx) => compact_track_tile(columns, idx, tempo[idx], queuedTracks.has(columns.track_id[idx])));
+
+            let title = table.title ? html_component("Div", {children: table.title, className: "p-1 mt-3 h3 fw-bold"}) : null;
+
+            return [title, tracks, num_of_pages, num_of_pages > 1 ? "m-1" : "d-none"];
+        },
+
+        render_virtual_tracks: function(table, filter_settings, bpm_sort_state, corrected_bpm_data, to_queue_done_data) {
+            if(!table) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            let view = derive_view(table, filter_settings, bpm_sort_state, corrected_bpm_data);
+            virtualList.table = table;
+            virtualList.tempo = view.tempo;
+            virtualList.indices = view.indices;
+            queuedTracks = new Set(to_queue_done_data || []);
+            reset_virtual_rows();
+
+            return table.title ? html_component("Div", {children: table.title, className: "p-1 mt-3 h3 fw-bold"}) : null;
+        },
+
+        export_view: function(_csv, _ndjson, _parquet, content_handle, filter_settings, bpm_sort_state, corrected_bpm_version, corrected_bpm_data) {
+            let triggered = window.dash_clientside.callback_context.triggered;
+            if(!content_handle || !triggered.length) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            let export_format = triggered[0].prop_id.split(".")[0].replace("export-view-", "");
+            let form = document.createElement("form");
+            form.method = "POST";
+            form.action = "/export";
+            form.className = "d-none";
+            let view = document.createElement("input");
+            view.type = "hidden";
+            view.name = "view";
+            view.value = JSON.stringify({
+                handle: content_handle,
+                format: export_format,
+                filter_settings: filter_settings,
+                bpm_sort_state: bpm_sort_state,
+                corrected_bpm_version: corrected_bpm_version,
+                corrected_bpm_data: corrected_bpm_data
+            });
+            form.appendChild(view);
+            document.body.appendChild(form);
+            form.submit();
+            form.remove();
+            return {format: export_format, timestamp: Date.now()};
+        },
+
+        update_bpm_sort_state: function(n_clicks, bpm_sort_state) {
+            let idx = Math.max(SORT_STATES.indexOf(bpm_sort_state), 0);
+            return SORT_STATES[(idx + 1) % SORT_STATES.length];
+        },
+
+        update_bpm_sort_icon: function(bpm_sort_state) {
+            return SORT_ICONS[Math.max(SORT_STATES.indexOf(bpm_sort_state), 0)];
+        }
+    }
+});
@@ -6,13 +6,19 @@ function set_listener() {
     if(url_input != null && header != null && content != null) {
         clearInterval(refreshID);
 
-        document.addEventListener("dragenter", () => {
+        document.addEventListener("dragenter", (event) => {
+            if(is_file_drag(event)) {
+                return;
+            }
             url_input.classList.toggle("expand");
             header.classList.toggle("hide");
             content.classList.toggle("hide");
         });
 
-        document.addEventListener("dragleave", () => {
+        document.addEventListener("dragleave", (event) => {
+            if(is_file_drag(event)) {
+                return;
+            }
             url_input.classList.toggle("expand");
             header.classList.toggle("hide");
             content.classList.toggle("hide");
@@ -26,5 +32,10 @@ function set_listener() {
     }
 }
 
+function is_file_drag(event) {
+    // files are dropped on the upload target below the URL input, so keep it on screen
+    return event.dataTransfer != null && Array.from(event.dataTransfer.types).includes("Files");
+}
+
 // call this function every 250 ms
 let refreshID = setInterval(set_listener, 250);
\ No newline at end of file
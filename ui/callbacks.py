@@ -2,13 +2,23 @@ import base64
 import json
 
 import dash_bootstrap_components as dbc
-from dash import Dash, Input, Output, html, no_update, ALL, ctx, State, MATCH
+import numpy as np
+from dash import Dash, Input, Output, html, no_update, ALL, ctx, State, MATCH, ClientsideFunction
 from dash.exceptions import PreventUpdate
-from spotipy import Spotify, SpotifyException, SpotifyPKCE, SpotifyOauthError
+from spotipy import Spotify, SpotifyException, SpotifyOauthError
 
 import data.spotify_content_extraction as content_extr
 import data.spotify_uri_utils as uri_utils
-from ui.layout.track_tile import TrackTile
+import data.track_library as track_library
+import data.track_table as track_table
+from data.request_scheduler import PRIORITY_INTERACTIVE
+from data.content_store import ContentStore
+from data.load_jobs import LoadJobs
+from data.spotify_clients import SpotifyClients
+from data.track_table import TrackTable
+from data.view_cache import ViewCache
+from ui import session
+from ui.layout.track_tile import TrackTile, CompactTrackTile
 
 DEFAULT_DOUBLE_SMALLER = 50
 DEFAULT_HALF_GREATER = 130
@@ -20,113 +30,282 @@ SORT_STATE_ASC = 'ascending'
 SORT_STATE_DESC = 'descending'
 
 
-def callbacks(app: Dash, spotify: Spotify, auth_manager: SpotifyPKCE):
+def callbacks(app: Dash, clients: SpotifyClients, content_store: ContentStore, view_cache: ViewCache, load_jobs: LoadJobs, compact_tiles: bool = True, clientside_view: bool = False, virtual_list: bool = False):
     @app.callback(
         Output('content-storage', 'data'),
         Output('url-input', 'value'),
         Output('error-bar', 'is_open', allow_duplicate=True),
         Output('error-bar', 'children', allow_duplicate=True),
-        Input('url-input', 'value')
+        Output('load-job', 'data'),
+        Output('load-job-poll', 'disabled'),
+        Output('load-progress', 'class_name', allow_duplicate=True),
+        Input('url-input', 'value'),
+        State('load-job', 'data')
     )
-    def update_content_storage(uri: str):
+    def update_content_storage(uri: str, load_job: dict):
         if not uri:
             raise PreventUpdate
 
+        uri = uri.strip()
         if not uri_utils.is_spotify_uri(uri):
-            return no_update, '', True, 'No Spotify URL.'
-
-        try:
-            if uri_utils.is_track_uri(uri):
+            return no_update, '', True, 'No Spotify URL.', no_update, no_update, no_update
+
+        if load_job:
+            load_jobs.cancel(load_job['job_id'])
+
+        spotify = current_spotify()
+        uris = uri_utils.find_spotify_uris(uri)
+        if len(uris) > 1:
+            sources = [uri_utils.parse_source(source_uri) for source_uri in uris]
+            job_id = start_load_job(lambda: content_extr.iter_content_batch(spotify, sources), ('batch', tuple(sources)))
+        elif uri_utils.is_album_uri(uri):
+            album_id = uri_utils.parse_album_uri(uri)
+            job_id = start_load_job(lambda: content_extr.iter_content_album(spotify, album_id), ('album', album_id))
+        elif uri_utils.is_playlist_uri(uri):
+            playlist_id = uri_utils.parse_playlist_uri(uri)
+            job_id = start_load_job(lambda: content_extr.iter_content_playlist(spotify, playlist_id), ('playlist', playlist_id))
+        elif uri_utils.is_track_uri(uri):
+            try:
                 content = content_extr.get_content_track(spotify, uri_utils.parse_track_uri(uri))
-            elif uri_utils.is_album_uri(uri):
-                content = content_extr.get_content_album(spotify, uri_utils.parse_album_uri(uri))
-            elif uri_utils.is_playlist_uri(uri):
-                content = content_extr.get_content_playlist(spotify, uri_utils.parse_playlist_uri(uri))
-            else:
-                return no_update, '', True, 'This kind of URL is not supported.'
-            return content, '', False, no_update
-        except SpotifyException as e:
-            return no_update, '', True, e.msg
+            except SpotifyException as e:
+                return no_update, '', True, e.msg, None, True, 'd-none'
+            return content_store.put(TrackTable.from_content(content)), '', False, no_update, None, True, 'd-none'
+        else:
+            return no_update, '', True, 'This kind of URL is not supported.', no_update, no_update, no_update
+
+        return no_update, '', False, no_update, {'job_id': job_id, 'handle': None}, False, 'load-progress mx-1'
 
     @app.callback(
-        Output('content-title', 'children'),
-        Output('tracks', 'children'),
-        Output('pager', 'max_value'),
-        Output('pager', 'class_name'),
-        Input('content-storage', 'modified_timestamp'),
-        Input('filter-settings', 'modified_timestamp'),
-        Input('bpm-sort-state', 'modified_timestamp'),
-        Input('corrected-bpm-storage', 'modified_timestamp'),
-        Input('pager', 'active_page'),
-        State('content-storage', 'data'),
+        Output('content-storage', 'data', allow_duplicate=True),
+        Output('error-bar', 'is_open', allow_duplicate=True),
+        Output('error-bar', 'children', allow_duplicate=True),
+        Output('load-job', 'data', allow_duplicate=True),
+        Output('load-job-poll', 'disabled', allow_duplicate=True),
+        Output('load-progress', 'class_name', allow_duplicate=True),
+        Input('library-search', 'value'),
+        State('load-job', 'data'),
         State('filter-settings', 'data'),
-        State('bpm-sort-state', 'data'),
-        State('corrected-bpm-storage', 'data')
+        State('corrected-bpm-storage', 'data'),
+        prevent_initial_call=True
     )
-    def update_content(_0, _1, _2, _3, active_page, data: dict, filter_settings: dict[str, float], bpm_sort_state: str, corrected_bpm_data: dict[str, float]):
-        if not data:
+    def search_library(search: str, load_job: dict, filter_settings: dict[str, float], corrected_bpm_data: dict[str, float]):
+        if not search or content_extr.track_library is None:
             raise PreventUpdate
 
+        library_query = track_library.parse_query(search)
+        if library_query is None:
+            return no_update, True, 'Search your library by BPM range and features, e.g. "122-126 energy>0.7".', no_update, no_update, no_update
+
+        if load_job:
+            load_jobs.cancel(load_job['job_id'])
+
         double_smaller = DEFAULT_DOUBLE_SMALLER
         half_greater = DEFAULT_HALF_GREATER
         if filter_settings:
-            if 'double' in filter_settings:
-                double_smaller = filter_settings['double']
-            if 'half' in filter_settings:
-                half_greater = filter_settings['half']
+            double_smaller = filter_settings.get('double', double_smaller)
+            half_greater = filter_settings.get('half', half_greater)
+
+        tracks = content_extr.track_library.query(
+            library_query['greater'],
+            library_query['smaller'],
+            double_smaller,
+            half_greater,
+            corrected_bpm_data,
+            library_query['conditions']
+        )
+        if not tracks:
+            return no_update, True, 'No tracks in your library match this search.', None, True, 'd-none'
 
-        if not corrected_bpm_data:
-            corrected_bpm_data = dict()
+        content = {'title': f'Library: {search.strip()}', 'tracks': tracks}
+        return content_store.put(TrackTable.from_content(content)), False, no_update, None, True, 'd-none'
 
-        tracks_data = data['tracks']
-
-        for track_data in tracks_data:
-            if track_data['track_id'] in corrected_bpm_data:
-                track_data['tempo'] = corrected_bpm_data[track_data['track_id']]
-            track_data['tempo'] = content_extr.correct_tempo(double_smaller, half_greater, track_data['tempo'])
-
-        filtered_data = [
-            track_data
-            for track_data in tracks_data
-            if content_extr.filter_tempo(filter_settings, track_data['tempo'])
-        ]
-
-        if bpm_sort_state == SORT_STATE_ASC:
-            filtered_data.sort(key=lambda d: d['tempo'])
-        if bpm_sort_state == SORT_STATE_DESC:
-            filtered_data.sort(key=lambda d: d['tempo'], reverse=True)
-
-        if active_page is None:
-            active_page = 1
-        num_of_pages = int(len(filtered_data) / TRACKS_PER_PAGE) + 1
-        if num_of_pages > 1:
-            start_offset = (active_page - 1) * TRACKS_PER_PAGE
-            end_offset = active_page * TRACKS_PER_PAGE
-            if end_offset > len(filtered_data):
-                end_offset = len(filtered_data)
-            display_data = filtered_data[start_offset:end_offset]
-        else:
-            display_data = filtered_data
-
-        tracks = [
-            TrackTile(
-                track_data['title'],
-                track_data['artist'],
-                track_data['img_url'],
-                track_data['track_id'],
-                track_data['tempo'],
-                track_data['acousticness'],
-                track_data['danceability'],
-                track_data['energy'],
-                track_data['instrumentalness'],
-                track_data['valence']
-            )
-            for track_data in display_data
-        ]
+    @app.callback(
+        Output('url-input', 'value', allow_duplicate=True),
+        Output('url-upload', 'contents'),
+        Output('error-bar', 'is_open', allow_duplicate=True),
+        Output('error-bar', 'children', allow_duplicate=True),
+        Input('url-upload', 'contents'),
+        prevent_initial_call=True
+    )
+    def upload_urls(uploaded_content):
+        if not uploaded_content:
+            raise PreventUpdate
 
-        title = html.Div(data['title'], className='p-1 mt-3 h3 fw-bold') if data['title'] else None
+        content_type, content_str = uploaded_content.split(',')
+        try:
+            decoded = base64.b64decode(content_str).decode('utf-8')
+        except UnicodeDecodeError:
+            return no_update, None, True, 'URLs could not be read from this file.'
 
-        return title, tracks, num_of_pages, 'm-1' if num_of_pages > 1 else 'd-none'
+        uris = uri_utils.find_spotify_uris(decoded)
+        if not uris:
+            return no_update, None, True, 'No Spotify URL.'
+        return ' '.join(uris), None, False, no_update
+
+    @app.callback(
+        Output('content-storage', 'data', allow_duplicate=True),
+        Output('load-job', 'data', allow_duplicate=True),
+        Output('load-job-poll', 'disabled', allow_duplicate=True),
+        Output('load-progress', 'value'),
+        Output('load-progress', 'max'),
+        Output('load-progress', 'label'),
+        Output('load-progress', 'class_name', allow_duplicate=True),
+        Output('error-bar', 'is_open', allow_duplicate=True),
+        Output('error-bar', 'children', allow_duplicate=True),
+        Input('load-job-poll', 'n_intervals'),
+        State('load-job', 'data'),
+        prevent_initial_call=True
+    )
+    def poll_load_job(_, load_job: dict):
+        if not load_job:
+            return no_update, no_update, True, no_update, no_update, no_update, 'd-none', no_update, no_update
+
+        status = load_jobs.status(load_job['job_id'])
+        if status is None:
+            return no_update, None, True, no_update, no_update, no_update, 'd-none', no_update, no_update
+
+        loaded = status['loaded']
+        progress = (loaded, max(status['total'], loaded, 1), f'{loaded}/{status["total"]}')
+
+        handle = no_update
+        if status['handle'] and status['handle'] != load_job['handle']:
+            handle = status['handle']
+            load_job = {'job_id': load_job['job_id'], 'handle': handle}
+
+        if not status['done']:
+            return handle, load_job, False, *progress, 'load-progress mx-1', no_update, no_update
+
+        error = status['error']
+        return handle, None, True, *progress, 'd-none', error is not None, error or no_update
+
+    def start_load_job(load, key) -> str:
+        return load_jobs.start(
+            load,
+            lambda content: content_store.put(TrackTable.from_content(content)),
+            content_store.discard,
+            (session.current_session_id(), *key)
+        )
+
+    if virtual_list:
+        app.clientside_callback(
+            ClientsideFunction(namespace='musicalify', function_name='render_virtual_tracks'),
+            Output('content-title', 'children'),
+            Input('client-track-table', 'data'),
+            Input('filter-settings', 'data'),
+            Input('bpm-sort-state', 'data'),
+            Input('corrected-bpm-storage', 'data'),
+            State('to-queue-done-storage', 'data')
+        )
+    elif clientside_view:
+        app.clientside_callback(
+            ClientsideFunction(namespace='musicalify', function_name='render_tracks'),
+            Output('content-title', 'children'),
+            Output('tracks', 'children'),
+            Output('pager', 'max_value'),
+            Output('pager', 'class_name'),
+            Input('client-track-table', 'data'),
+            Input('filter-settings', 'data'),
+            Input('bpm-sort-state', 'data'),
+            Input('corrected-bpm-storage', 'data'),
+            Input('pager', 'active_page'),
+            State('to-queue-done-storage', 'data')
+        )
+
+    if virtual_list or clientside_view:
+        @app.callback(
+            Output('client-track-table', 'data'),
+            Input('content-storage', 'data')
+        )
+        def update_client_track_table(content_handle: str):
+            table = content_store.get(content_handle)
+            if not table:
+                raise PreventUpdate
+
+            return {
+                'title': table.title,
+                'columns': table.to_dict(),
+                'settings': {
+                    'double_smaller': DEFAULT_DOUBLE_SMALLER,
+                    'half_greater': DEFAULT_HALF_GREATER,
+                    'tracks_per_page': TRACKS_PER_PAGE
+                }
+            }
+    else:
+        @app.callback(
+            Output('content-title', 'children'),
+            Output('tracks', 'children'),
+            Output('pager', 'max_value'),
+            Output('pager', 'class_name'),
+            Input('content-storage', 'modified_timestamp'),
+            Input('filter-settings', 'modified_timestamp'),
+            Input('bpm-sort-state', 'modified_timestamp'),
+            Input('corrected-bpm-storage', 'modified_timestamp'),
+            Input('pager', 'active_page'),
+            State('content-storage', 'data'),
+            State('filter-settings', 'data'),
+            State('bpm-sort-state', 'data'),
+            State('corrected-bpm-storage', 'data'),
+            State('to-queue-done-storage', 'data')
+        )
+        def update_content(_0, _1, _2, corrected_bpm_version, active_page, content_handle: str, filter_settings: dict[str, float], bpm_sort_state: str, corrected_bpm_data: dict[str, float], to_queue_done_data: list):
+            table = content_store.get(content_handle)
+            if not table:
+                raise PreventUpdate
+
+            tempo, indices = view_cache.get(
+                content_handle,
+                view_key(filter_settings, bpm_sort_state, corrected_bpm_version),
+                lambda: derive_view(table, filter_settings, bpm_sort_state, corrected_bpm_version, corrected_bpm_data)
+            )
+
+            if active_page is None:
+                active_page = 1
+            num_of_pages = int(len(indices) / TRACKS_PER_PAGE) + 1
+            if num_of_pages > 1:
+                display_indices = indices[(active_page - 1) * TRACKS_PER_PAGE:active_page * TRACKS_PER_PAGE]
+            else:
+                display_indices = indices
+            display_data = table.rows(display_indices, tempo)
+
+            queued = set(to_queue_done_data) if to_queue_done_data else set()
+            if compact_tiles:
+                tracks = [
+                    CompactTrackTile(
+                        track_data['title'],
+                        track_data['artist'],
+                        track_data['img_url'],
+                        track_data['track_id'],
+                        track_data['tempo'],
+                        track_data['acousticness'],
+                        track_data['danceability'],
+                        track_data['energy'],
+                        track_data['instrumentalness'],
+                        track_data['valence'],
+                        track_data['track_id'] in queued
+                    )
+                    for track_data in display_data
+                ]
+            else:
+                tracks = [
+                    TrackTile(
+                        track_data['title'],
+                        track_data['artist'],
+                        track_data['img_url'],
+                        track_data['track_id'],
+                        track_data['tempo'],
+                        track_data['acousticness'],
+                        track_data['danceability'],
+                        track_data['energy'],
+                        track_data['instrumentalness'],
+                        track_data['valence'],
+                        track_data['track_id'] in queued
+                    )
+                    for track_data in display_data
+                ]
+
+            title = html.Div(table.title, className='p-1 mt-3 h3 fw-bold') if table.title else None
+
+            return title, tracks, num_of_pages, 'm-1' if num_of_pages > 1 else 'd-none'
 
     @app.callback(
         Output('user-header', 'children'),
@@ -136,6 +315,7 @@ def callbacks(app: Dash, spotify: Spotify, auth_manager: SpotifyPKCE):
         if not url:
             raise PreventUpdate
 
+        spotify, auth_manager = clients.get(session.current_session_id())
         access_token = ""
 
         token_info = auth_manager.get_cached_token()
@@ -150,7 +330,7 @@ def callbacks(app: Dash, spotify: Spotify, auth_manager: SpotifyPKCE):
                     pass
 
         if access_token:
-            user = spotify.current_user()
+            user = content_extr.scheduler.call(spotify.current_user, priority=PRIORITY_INTERACTIVE)
             return [
                 html.I(className='bi bi-person-circle me-2'),
                 html.Div(user['display_name'])
@@ -165,47 +345,62 @@ def callbacks(app: Dash, spotify: Spotify, auth_manager: SpotifyPKCE):
             )]
 
     @app.callback(
-        Output('to-queue-done-storage', 'data'),
+        Output('queued-track', 'data'),
         Output('error-bar', 'is_open', allow_duplicate=True),
         Output('error-bar', 'children', allow_duplicate=True),
-        Input({'type': 'to-queue', 'id': ALL}, 'n_clicks'),
-        State('to-queue-done-storage', 'data'),
+        Input('track-action', 'data'),
         prevent_initial_call=True
     )
-    def add_to_queue(n_clicks, to_queue_done_data: list):
-        if all(n is None for n in n_clicks):
+    def add_to_queue(track_action: dict):
+        if not track_action or track_action['action'] != 'to-queue':
             raise PreventUpdate
 
-        _id = ctx.triggered_id
-        track_id = _id['id']
+        track_id = track_action['track_id']
         if not track_id:
             raise PreventUpdate
 
         try:
-            spotify.add_to_queue(track_id)
+            content_extr.scheduler.call(current_spotify().add_to_queue, track_id, priority=PRIORITY_INTERACTIVE)
         except SpotifyException as e:
             return no_update, True, e.msg
 
-        if not to_queue_done_data:
-            to_queue_done_data = list()
-        if track_id not in to_queue_done_data:
-            to_queue_done_data.append(track_id)
-        return to_queue_done_data, no_update, no_update
+        return {'track_id': track_id}, no_update, no_update
 
-    @app.callback(
-        Output({'type': 'to-queue-done', 'id': ALL}, 'is_open'),
-        Input('to-queue-done-storage', 'modified_timestamp'),
-        State({'type': 'to-queue', 'id': ALL}, 'id'),
-        State('to-queue-done-storage', 'data')
+    app.clientside_callback(
+        ClientsideFunction(namespace='musicalify', function_name='append_queue_done'),
+        Output('to-queue-done-storage', 'data'),
+        Input('queued-track', 'data'),
+        State('to-queue-done-storage', 'data'),
+        prevent_initial_call=True
     )
-    def update_to_queue_done(_, ids, to_queue_done_data):
-        if not to_queue_done_data:
-            raise PreventUpdate
 
-        return [
-            _id['id'] in to_queue_done_data
-            for _id in ids
-        ]
+    app.clientside_callback(
+        ClientsideFunction(namespace='musicalify', function_name='dispatch_track_action'),
+        Output('track-action', 'data'),
+        Input('track-action-trigger', 'n_clicks'),
+        prevent_initial_call=True
+    )
+
+    app.clientside_callback(
+        ClientsideFunction(namespace='musicalify', function_name='export_view'),
+        Output('export-view-request', 'data'),
+        Input('export-view-csv', 'n_clicks'),
+        Input('export-view-ndjson', 'n_clicks'),
+        Input('export-view-parquet', 'n_clicks'),
+        State('content-storage', 'data'),
+        State('filter-settings', 'data'),
+        State('bpm-sort-state', 'data'),
+        State('corrected-bpm-storage', 'modified_timestamp'),
+        State('corrected-bpm-storage', 'data'),
+        prevent_initial_call=True
+    )
+
+    app.clientside_callback(
+        ClientsideFunction(namespace='musicalify', function_name='mark_queue_done'),
+        Output('queue-done-marker', 'data'),
+        Input('to-queue-done-storage', 'data'),
+        prevent_initial_call=True
+    )
 
     @app.callback(
         Output('filter-modal', 'is_open'),
@@ -336,33 +531,48 @@ def callbacks(app: Dash, spotify: Spotify, auth_manager: SpotifyPKCE):
 
         return check_greater, check_smaller, greater_input, smaller_input, double_input, half_input
 
-    @app.callback(
-        Output('bpm-sort-state', 'data'),
-        Input('sort', 'n_clicks'),
-        State('bpm-sort-state', 'data'),
-        prevent_initial_call=True
-    )
-    def update_bpm_sort_state(_, bpm_sort_state: str):
-        if not bpm_sort_state or bpm_sort_state == SORT_STATE_NONE:
-            return SORT_STATE_ASC
-        if bpm_sort_state == SORT_STATE_ASC:
-            return SORT_STATE_DESC
-        if bpm_sort_state == SORT_STATE_DESC:
-            return SORT_STATE_NONE
+    if virtual_list or clientside_view:
+        app.clientside_callback(
+            ClientsideFunction(namespace='musicalify', function_name='update_bpm_sort_state'),
+            Output('bpm-sort-state', 'data'),
+            Input('sort', 'n_clicks'),
+            State('bpm-sort-state', 'data'),
+            prevent_initial_call=True
+        )
 
-    @app.callback(
-        Output('sort-icon', 'className'),
-        Input('bpm-sort-state', 'modified_timestamp'),
-        State('bpm-sort-state', 'data')
-    )
-    def update_bpm_sort_icon(_, bpm_sort_state):
-        margin = ' me-1'
-        if not bpm_sort_state or bpm_sort_state == SORT_STATE_NONE:
-            return 'bi bi-arrow-down-up' + margin
-        if bpm_sort_state == SORT_STATE_ASC:
-            return 'bi bi-arrow-down' + margin
-        if bpm_sort_state == SORT_STATE_DESC:
-            return 'bi bi-arrow-up' + margin
+        app.clientside_callback(
+            ClientsideFunction(namespace='musicalify', function_name='update_bpm_sort_icon'),
+            Output('sort-icon', 'className'),
+            Input('bpm-sort-state', 'data')
+        )
+    else:
+        @app.callback(
+            Output('bpm-sort-state', 'data'),
+            Input('sort', 'n_clicks'),
+            State('bpm-sort-state', 'data'),
+            prevent_initial_call=True
+        )
+        def update_bpm_sort_state(_, bpm_sort_state: str):
+            if not bpm_sort_state or bpm_sort_state == SORT_STATE_NONE:
+                return SORT_STATE_ASC
+            if bpm_sort_state == SORT_STATE_ASC:
+                return SORT_STATE_DESC
+            if bpm_sort_state == SORT_STATE_DESC:
+                return SORT_STATE_NONE
+
+        @app.callback(
+            Output('sort-icon', 'className'),
+            Input('bpm-sort-state', 'modified_timestamp'),
+            State('bpm-sort-state', 'data')
+        )
+        def update_bpm_sort_icon(_, bpm_sort_state):
+            margin = ' me-1'
+            if not bpm_sort_state or bpm_sort_state == SORT_STATE_NONE:
+                return 'bi bi-arrow-down-up' + margin
+            if bpm_sort_state == SORT_STATE_ASC:
+                return 'bi bi-arrow-down' + margin
+            if bpm_sort_state == SORT_STATE_DESC:
+                return 'bi bi-arrow-up' + margin
 
     @app.callback(
         Output('local-settings-modal', 'is_open'),
@@ -404,15 +614,20 @@ def callbacks(app: Dash, spotify: Spotify, auth_manager: SpotifyPKCE):
         Output('error-bar', 'is_open', allow_duplicate=True),
         Output('error-bar', 'children', allow_duplicate=True),
         Input({'type': 'edit-bpm', 'id': ALL}, 'n_clicks'),
+        Input('edit-bpm-request', 'data'),
         State('corrected-bpm-storage', 'data'),
+        State('content-storage', 'data'),
         prevent_initial_call=True
     )
-    def open_edit_bpm_value(n_clicks, corrected_bpm_data: dict[str, float]):
-        if all(n is None for n in n_clicks):
-            raise PreventUpdate
-
-        _id = ctx.triggered_id
-        track_id = _id['id']
+    def open_edit_bpm_value(n_clicks, edit_bpm_request: dict, corrected_bpm_data: dict[str, float], content_handle: str):
+        if ctx.triggered_id == 'edit-bpm-request':
+            if not edit_bpm_request:
+                raise PreventUpdate
+            track_id = edit_bpm_request['track_id']
+        else:
+            if all(n is None for n in n_clicks):
+                raise PreventUpdate
+            track_id = ctx.triggered_id['id']
         if not track_id:
             raise PreventUpdate
 
@@ -420,12 +635,23 @@ def callbacks(app: Dash, spotify: Spotify, auth_manager: SpotifyPKCE):
             if corrected_bpm_data and track_id in corrected_bpm_data:
                 tempo = corrected_bpm_data[track_id]
             else:
-                track_data = content_extr.get_content_track(spotify, track_id)
-                tempo = round(track_data['tracks'][0]['tempo'])
+                tempo = round(lookup_track_tempo(track_id, content_handle))
             return True, tempo, track_id, False, no_update
         except SpotifyException as e:
             return False, no_update, no_update, True, e.msg
 
+    def current_spotify() -> Spotify:
+        return clients.get(session.current_session_id())[0]
+
+    def lookup_track_tempo(track_id: str, content_handle: str) -> float:
+        table = content_store.get(content_handle)
+        track_data = table.track(track_id) if table is not None else None
+        if track_data is None:
+            track_data = content_extr.get_track_features(current_spotify(), uri_utils.parse_track_id(track_id))
+        if track_data is None:
+            raise SpotifyException(404, -1, 'Track not found.')
+        return track_data['tempo']
+
     @app.callback(
         Output({'type': 'stats-popover', 'id': MATCH}, 'is_open'),
         Input({'type': 'edit-bpm', 'id': MATCH}, 'n_clicks'),
@@ -434,6 +660,13 @@ def callbacks(app: Dash, spotify: Spotify, auth_manager: SpotifyPKCE):
     def close_popover_on_edit_click(_):
         return False
 
+    app.clientside_callback(
+        ClientsideFunction(namespace='musicalify', function_name='request_edit_bpm'),
+        Output('edit-bpm-request', 'data'),
+        Input('stats-panel-edit-bpm', 'n_clicks'),
+        prevent_initial_call=True
+    )
+
     @app.callback(
         Output('corrected-bpm-storage', 'data'),
         Output('edit-bpm-value-modal', 'is_open', allow_duplicate=True),
@@ -520,3 +753,31 @@ def callbacks(app: Dash, spotify: Spotify, auth_manager: SpotifyPKCE):
             pass
 
         return no_update, None, True, 'BPM values could not be imported due to incorrect file format.'
+
+
+def derive_view(table: TrackTable, filter_settings: dict[str, float], bpm_sort_state: str, corrected_bpm_version, corrected_bpm_data: dict[str, float]):
+    double_smaller = DEFAULT_DOUBLE_SMALLER
+    half_greater = DEFAULT_HALF_GREATER
+    if filter_settings:
+        if 'double' in filter_settings:
+            double_smaller = filter_settings['double']
+        if 'half' in filter_settings:
+            half_greater = filter_settings['half']
+
+    tempo = table.corrected_tempo(corrected_bpm_version, corrected_bpm_data, double_smaller, half_greater)
+    indices = np.flatnonzero(track_table.filter_tempos(filter_settings, tempo))
+
+    if bpm_sort_state == SORT_STATE_ASC:
+        indices = track_table.sort_indices(indices, tempo, descending=False)
+    if bpm_sort_state == SORT_STATE_DESC:
+        indices = track_table.sort_indices(indices, tempo, descending=True)
+
+    return tempo, indices
+
+
+def view_key(filter_settings: dict[str, float], bpm_sort_state: str, corrected_bpm_version) -> tuple:
+    return (
+        tuple(sorted(filter_settings.items())) if filter_settings else (),
+        bpm_sort_state,
+        corrected_bpm_version
+    )
@@ -0,0 +1,142 @@
+import csv
+import io
+import json
+from typing import Iterator
+
+import flask
+import numpy as np
+from dash import Dash
+
+from data.content_store import ContentStore
+from data.track_table import TrackTable, STRING_COLUMNS, NUMERIC_COLUMNS
+from data.view_cache import ViewCache
+from ui.callbacks import derive_view, view_key
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+EXPORT_ROUTE = '/export'
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_COLUMNS = STRING_COLUMNS + NUMERIC_COLUMNS
+
+FORMAT_CSV = 'csv'
+FORMAT_NDJSON = 'ndjson'
+FORMAT_PARQUET = 'parquet'
+MIMETYPES = {
+    FORMAT_CSV: 'text/csv',
+    FORMAT_NDJSON: 'application/x-ndjson',
+    FORMAT_PARQUET: 'application/vnd.apache.parquet'
+}
+
+
+class ChunkSink(io.RawIOBase):
+    chunks: list[bytes]
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = list()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def init_export(app: Dash, content_store: ContentStore, view_cache: ViewCache):
+    @app.server.route(EXPORT_ROUTE, methods=['POST'])
+    def export_view():
+        try:
+            view = json.loads(flask.request.form['view'])
+        except (KeyError, json.JSONDecodeError):
+            flask.abort(400)
+
+        export_format = view.get('format')
+        if export_format not in MIMETYPES:
+            flask.abort(400)
+        if export_format == FORMAT_PARQUET and pq is None:
+            flask.abort(501, 'Parquet export requires pyarrow.')
+
+        handle = view.get('handle')
+        table = content_store.get(handle)
+        if table is None:
+            flask.abort(404)
+
+        filter_settings = view.get('filter_settings')
+        bpm_sort_state = view.get('bpm_sort_state')
+        corrected_bpm_version = view.get('corrected_bpm_version')
+        corrected_bpm_data = view.get('corrected_bpm_data')
+        tempo, indices = view_cache.get(
+            handle,
+            view_key(filter_settings, bpm_sort_state, corrected_bpm_version),
+            lambda: derive_view(table, filter_settings, bpm_sort_state, corrected_bpm_version, corrected_bpm_data)
+        )
+
+        if export_format == FORMAT_CSV:
+            body = iter_csv(table, tempo, indices)
+        elif export_format == FORMAT_NDJSON:
+            body = iter_ndjson(table, tempo, indices)
+        else:
+            body = iter_parquet(table, tempo, indices)
+
+        return flask.Response(
+            body,
+            mimetype=MIMETYPES[export_format],
+            headers={'Content-Disposition': f'attachment; filename="{export_filename(table, export_format)}"'}
+        )
+
+
+def iter_columns(table: TrackTable, tempo: np.ndarray, indices: np.ndarray) -> Iterator[dict[str, list]]:
+    for start in range(0, len(indices), EXPORT_CHUNK_SIZE):
+        chunk = indices[start:start + EXPORT_CHUNK_SIZE]
+        columns = {name: table[name][chunk].tolist() for name in EXPORT_COLUMNS}
+        columns['tempo'] = tempo[chunk].tolist()
+        yield columns
+
+
+def iter_csv(table: TrackTable, tempo: np.ndarray, indices: np.ndarray) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for columns in iter_columns(table, tempo, indices):
+        writer.writerows(zip(*(columns[name] for name in EXPORT_COLUMNS)))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_ndjson(table: TrackTable, tempo: np.ndarray, indices: np.ndarray) -> Iterator[str]:
+    for columns in iter_columns(table, tempo, indices):
+        yield ''.join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), separators=(',', ':')) + '\n'
+            for row in zip(*(columns[name] for name in EXPORT_COLUMNS))
+        )
+
+
+def iter_parquet(table: TrackTable, tempo: np.ndarray, indices: np.ndarray) -> Iterator[bytes]:
+    schema = pa.schema(
+        [(name, pa.string()) for name in STRING_COLUMNS] + [(name, pa.float64()) for name in NUMERIC_COLUMNS]
+    )
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema)
+    for columns in iter_columns(table, tempo, indices):
+        writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def export_filename(table: TrackTable, export_format: str) -> str:
+    title = ''.join(char if char.isalnum() or char in '-_' else '-' for char in table.title or 'tracks').strip('-')
+    return f'{title or "tracks"}.musicalify.{export_format}'
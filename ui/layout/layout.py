@@ -18,6 +18,14 @@ class Layout(html.Div):
                 dcc.Store(id='filter-settings', storage_type='session'),
                 dcc.Store(id='bpm-sort-state', storage_type='session'),
                 dcc.Store(id='corrected-bpm-storage', storage_type='local'),
+                dcc.Store(id='edit-bpm-request'),
+                dcc.Store(id='client-track-table'),
+                dcc.Store(id='track-action'),
+                dcc.Store(id='queued-track'),
+                dcc.Store(id='queue-done-marker'),
+                dcc.Store(id='load-job'),
+                dcc.Store(id='export-view-request'),
+                dcc.Interval(id='load-job-poll', interval=500, disabled=True),
                 html.Div(
                     id='header',
                     children=[
@@ -48,13 +56,40 @@ class Layout(html.Div):
                     children=[
                         dbc.Input(
                             id='url-input',
-                            type='url',
-                            placeholder='Paste your track or playlist URL here.',
+                            type='text',
+                            placeholder='Paste your track, album or playlist URLs here.',
                             className='url-input w-100 p-4'
+                        ),
+                        html.Div(
+                            children=[
+                                dbc.Input(
+                                    id='library-search',
+                                    type='search',
+                                    debounce=True,
+                                    placeholder='Search your library, e.g. 122-126 energy>0.7',
+                                    size='sm',
+                                    className='library-search'
+                                ),
+                                dcc.Upload(
+                                    html.A('or drop a text file of URLs', className='alt small'),
+                                    id='url-upload',
+                                    accept='.txt,text/plain',
+                                    max_size=1048576,  # =1MB
+                                    className='ms-2'
+                                )
+                            ],
+                            className='d-flex justify-content-between align-items-center pt-1'
                         )
                     ],
                     className='p-1'
                 ),
+                dbc.Progress(
+                    id='load-progress',
+                    value=0,
+                    striped=True,
+                    animated=True,
+                    class_name='d-none'
+                ),
                 html.Div(
                     id='content',
                     children=[
@@ -82,7 +117,19 @@ class Layout(html.Div):
                                         html.I(className='bi bi-filter me-1'),
                                         'Filter'
                                     ],
-                                    size='sm'
+                                    size='sm',
+                                    className='me-2'
+                                ),
+                                dbc.DropdownMenu(
+                                    id='export-view',
+                                    children=[
+                                        dbc.DropdownMenuItem('CSV', id='export-view-csv'),
+                                        dbc.DropdownMenuItem('NDJSON', id='export-view-ndjson'),
+                                        dbc.DropdownMenuItem('Parquet', id='export-view-parquet')
+                                    ],
+                                    label='Export',
+                                    size='sm',
+                                    align_end=True
                                 )
                             ],
                             className='p-1 d-flex justify-content-end'
@@ -91,6 +138,11 @@ class Layout(html.Div):
                             id='tracks',
                             className='p-1'
                         ),
+                        html.Div(
+                            id='virtual-tracks',
+                            className='virtual-tracks list-group mx-1'
+                        ),
+                        html.Button(id='track-action-trigger', className='d-none'),
                         html.Div(
                             children=[
                                 dbc.Pagination(
@@ -133,7 +185,8 @@ class Layout(html.Div):
                 ),
                 modals.FilterSettings(),
                 modals.LocalSettings(),
-                modals.EditBPMValue()
+                modals.EditBPMValue(),
+                modals.StatsPanel()
             ],
             className='p-1'
         )
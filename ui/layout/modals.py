@@ -1,6 +1,8 @@
 import dash_bootstrap_components as dbc
 from dash import html, dcc
 
+STATS_FEATURES = ('acousticness', 'danceability', 'energy', 'instrumentalness', 'valence')
+
 
 class FilterSettings(dbc.Modal):
     def __init__(self):
@@ -159,3 +161,35 @@ class EditBPMValue(dbc.Modal):
             centered=True,
             is_open=False
         )
+
+
+class StatsPanel(html.Div):
+    def __init__(self):
+        super().__init__(
+            id='stats-panel',
+            children=[
+                html.Div(
+                    html.A(
+                        children=[
+                            html.I(className='bi bi-pencil-square me-2'),
+                            'Edit bpm'
+                        ],
+                        id='stats-panel-edit-bpm',
+                        className='alt'
+                    ),
+                    className='popover-header'
+                ),
+                html.Div(
+                    dbc.Table(
+                        html.Tbody([
+                            html.Tr([html.Td(feature.capitalize()), html.Td(id=f'stats-panel-{feature}')])
+                            for feature in STATS_FEATURES
+                        ]),
+                        borderless=True,
+                        className='compact'
+                    ),
+                    className='p-2'
+                )
+            ],
+            className='popover stats-panel d-none'
+        )
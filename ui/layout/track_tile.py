@@ -4,6 +4,28 @@ from dash import html
 from ui.layout.layout import IMG_SIZE
 
 
+class TrackInfo(html.Div):
+    def __init__(self, title: str, artist: str, img_url: str, track_id: str):
+        super().__init__(
+            children=[
+                html.Img(src=img_url, width=IMG_SIZE, height=IMG_SIZE),
+                html.Div(
+                    children=[
+                        html.A(
+                            title,
+                            className='title fw-bold text-body text-decoration-none',
+                            href=track_id,
+                            target='_blank'
+                        ),
+                        html.Div(artist, className='text-muted')
+                    ],
+                    className='d-flex flex-column ms-3'
+                )
+            ],
+            className='d-flex flex-row'
+        )
+
+
 class TrackTile(dbc.ListGroupItem):
     def __init__(self,
                  title: str,
@@ -15,28 +37,12 @@ class TrackTile(dbc.ListGroupItem):
                  danceability: float,
                  energy: float,
                  instrumentalness: float,
-                 valence: float
+                 valence: float,
+                 queued: bool = False
                  ):
         super().__init__(
             children=[
-                html.Div(
-                    children=[
-                        html.Img(src=img_url, width=IMG_SIZE, height=IMG_SIZE),
-                        html.Div(
-                            children=[
-                                html.A(
-                                    title,
-                                    className='title fw-bold text-body text-decoration-none',
-                                    href=track_id,
-                                    target='_blank'
-                                ),
-                                html.Div(artist, className='text-muted')
-                            ],
-                            className='d-flex flex-column ms-3'
-                        )
-                    ],
-                    className='d-flex flex-row'
-                ),
+                TrackInfo(title, artist, img_url, track_id),
                 html.Div(
                     children=[
                         html.Div(f'{round(tempo)} bpm'),
@@ -81,7 +87,8 @@ class TrackTile(dbc.ListGroupItem):
                                 html.A(
                                     html.I(className='bi bi-view-stacked'),
                                     id={'type': 'to-queue', 'id': track_id},
-                                    className='ms-4 p-1'
+                                    className='ms-4 p-1 track-action',
+                                    **{'data-action': 'to-queue', 'data-track-id': track_id}
                                 ),
                                 dbc.Tooltip(
                                     'Add to queue',
@@ -90,13 +97,55 @@ class TrackTile(dbc.ListGroupItem):
                                 )
                             ],
                         ),
-                        dbc.Collapse(
-                            id={'type': 'to-queue-done', 'id': track_id},
-                            children=[
-                                html.I(className='bi bi-check')
-                            ],
-                            dimension='width',
-                            is_open=False
+                        html.I(
+                            className='bi bi-check queue-done' + ('' if queued else ' d-none'),
+                            **{'data-track-id': track_id}
+                        )
+                    ],
+                    className='d-flex flex-row flex-shrink-0'
+                )
+            ],
+            className='d-flex justify-content-between align-items-center'
+        )
+
+
+class CompactTrackTile(dbc.ListGroupItem):
+    def __init__(self,
+                 title: str,
+                 artist: str,
+                 img_url: str,
+                 track_id: str,
+                 tempo: float,
+                 acousticness: float,
+                 danceability: float,
+                 energy: float,
+                 instrumentalness: float,
+                 valence: float,
+                 queued: bool = False
+                 ):
+        stats = (acousticness, danceability, energy, instrumentalness, valence)
+        super().__init__(
+            children=[
+                TrackInfo(title, artist, img_url, track_id),
+                html.Div(
+                    children=[
+                        html.Div(f'{round(tempo)} bpm'),
+                        html.I(
+                            className='bi bi-three-dots-vertical ms-1 px-1 stats-trigger',
+                            **{
+                                'data-track-id': track_id,
+                                'data-stats': ','.join(str(round(value * 100)) for value in stats)
+                            }
+                        ),
+                        html.A(
+                            html.I(className='bi bi-view-stacked'),
+                            title='Add to queue',
+                            className='ms-4 p-1 track-action',
+                            **{'data-action': 'to-queue', 'data-track-id': track_id}
+                        ),
+                        html.I(
+                            className='bi bi-check queue-done' + ('' if queued else ' d-none'),
+                            **{'data-track-id': track_id}
                         )
                     ],
                     className='d-flex flex-row flex-shrink-0'
@@ -0,0 +1,92 @@
+import time
+from urllib.parse import urlparse
+
+import flask
+import requests
+from dash import Dash
+
+import data.spotify_content_extraction as content_extr
+from data.content_store import ContentStore
+from data.metrics import registry, SIZE_BUCKETS
+from data.request_scheduler import RATE_LIMITED_STATUS
+from data.view_cache import ViewCache
+
+METRICS_ROUTE = '/metrics'
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+CALLBACK_ROUTE_SUFFIX = '_dash-update-component'
+ID_COLLECTIONS = ('albums', 'artists', 'playlists', 'tracks', 'users')
+
+spotify_requests = registry.counter('musicalify_spotify_requests_total', 'Spotify Web API responses by endpoint and status; 5xx errors retried by the transport count once.')
+spotify_rate_limited = registry.counter('musicalify_spotify_rate_limited_total', 'Spotify Web API responses with status 429, each one seen by the request scheduler.')
+spotify_seconds = registry.histogram('musicalify_spotify_request_seconds', 'Spotify Web API request latency.')
+spotify_bytes = registry.histogram('musicalify_spotify_response_bytes', 'Spotify Web API response payload size.', SIZE_BUCKETS)
+callback_calls = registry.counter('musicalify_callback_calls_total', 'Dash callback invocations by status.')
+callback_seconds = registry.histogram('musicalify_callback_seconds', 'Dash callback latency.')
+callback_bytes = registry.histogram('musicalify_callback_response_bytes', 'Dash callback response size.', SIZE_BUCKETS)
+
+
+def init_metrics(app: Dash, session: requests.Session, content_store: ContentStore, view_cache: ViewCache):
+    session.hooks['response'].append(record_spotify_response)
+
+    registry.gauge_function('musicalify_cache_hit_ratio', 'Hit ratio of the track, feature, playlist and view caches.', lambda: cache_stats(view_cache, 'hit_ratio'))
+    registry.gauge_function('musicalify_cache_hits', 'Hits of the track, feature, playlist and view caches.', lambda: cache_stats(view_cache, 'hits'))
+    registry.gauge_function('musicalify_cache_misses', 'Misses of the track, feature, playlist and view caches.', lambda: cache_stats(view_cache, 'misses'))
+    registry.gauge_function('musicalify_content_store_entries', 'Loaded track tables held in memory.', lambda: [({}, len(content_store))])
+    registry.gauge_function('musicalify_scheduler_queued', 'Spotify calls waiting for a scheduler token.', scheduler_queued)
+    registry.gauge_function('musicalify_scheduler_throttled', 'Rate-limit pauses taken by the request scheduler.', lambda: [({}, content_extr.scheduler.stats()['throttled'])])
+
+    server = app.server
+
+    @server.before_request
+    def start_callback_timer():
+        flask.g.metrics_started_at = time.perf_counter()
+
+    @server.after_request
+    def record_callback(response: flask.Response) -> flask.Response:
+        if flask.request.path.endswith(CALLBACK_ROUTE_SUFFIX) and 'metrics_started_at' in flask.g:
+            name = callback_name(app)
+            callback_calls.inc(callback=name, status=str(response.status_code))
+            callback_seconds.observe(time.perf_counter() - flask.g.metrics_started_at, callback=name)
+            if not response.is_streamed:
+                callback_bytes.observe(response.calculate_content_length() or 0, callback=name)
+        return response
+
+    @server.route(METRICS_ROUTE)
+    def metrics():
+        return flask.Response(registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+
+def record_spotify_response(response: requests.Response, *args, **kwargs):
+    endpoint = normalize_endpoint(response.request.url)
+    method = response.request.method
+    spotify_requests.inc(endpoint=endpoint, method=method, status=str(response.status_code))
+    spotify_seconds.observe(response.elapsed.total_seconds(), endpoint=endpoint, method=method)
+    spotify_bytes.observe(len(response.content), endpoint=endpoint, method=method)
+    if response.status_code == RATE_LIMITED_STATUS:
+        spotify_rate_limited.inc(endpoint=endpoint)
+
+
+def normalize_endpoint(url: str) -> str:
+    segments = [segment for segment in urlparse(url).path.split('/') if segment]
+    for idx in range(1, len(segments)):
+        if segments[idx - 1] in ID_COLLECTIONS:
+            segments[idx] = '{id}'
+    return '/' + '/'.join(segments)
+
+
+def callback_name(app: Dash) -> str:
+    payload = flask.request.get_json(silent=True) or {}
+    callback = app.callback_map.get(payload.get('output'), {}).get('callback')
+    return callback.__name__ if callback else 'unknown'
+
+
+def cache_stats(view_cache: ViewCache, key: str) -> list[tuple[dict[str, str], float]]:
+    result = list()
+    if content_extr.track_cache is not None:
+        result.extend(({'cache': table}, stats[key]) for table, stats in content_extr.track_cache.stats().items())
+    result.append(({'cache': 'view'}, view_cache.stats()[key]))
+    return result
+
+
+def scheduler_queued() -> list[tuple[dict[str, str], float]]:
+    return [({'priority': priority}, count) for priority, count in content_extr.scheduler.stats()['queued'].items()]
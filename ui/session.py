@@ -0,0 +1,41 @@
+import os
+import secrets
+import tempfile
+import uuid
+
+import flask
+
+SESSION_ID_KEY = 'session_id'
+SECRET_KEY_ENV = 'MUSICALIFY_SECRET_KEY'
+DEFAULT_SECRET_KEY_PATH = '.musicalify-secret'
+
+
+def init_session(server: flask.Flask, secret_key_path: str = DEFAULT_SECRET_KEY_PATH):
+    server.secret_key = os.environ.get(SECRET_KEY_ENV) or load_secret_key(secret_key_path)
+
+    @server.before_request
+    def ensure_session_id():
+        if SESSION_ID_KEY not in flask.session:
+            flask.session[SESSION_ID_KEY] = uuid.uuid4().hex
+            flask.session.permanent = True
+
+
+def current_session_id() -> str:
+    return flask.session[SESSION_ID_KEY]
+
+
+def load_secret_key(path: str) -> str:
+    if not os.path.exists(path):
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                file.write(secrets.token_hex(32))
+            os.link(temp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(temp_path)
+
+    with open(path, encoding='utf-8') as file:
+        return file.read().strip()
@@ -0,0 +1,11 @@
+import os
+
+from ui.app import App, CLIENTSIDE_VIEW_ENV, VIRTUAL_LIST_ENV, env_flag
+
+server = App(
+    debug=False,
+    clientside_view=env_flag(CLIENTSIDE_VIEW_ENV),
+    virtual_list=env_flag(VIRTUAL_LIST_ENV),
+    shared_state=True,
+    workers=int(os.environ.get('WEB_CONCURRENCY', 1))
+).app.server